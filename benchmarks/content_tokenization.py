@@ -0,0 +1,108 @@
+"""Time ContentCollector's text analyses before and after sharing one TextDocument
+
+The "before" path reproduces the old behaviour: every analysis tokenized the
+text itself (four word_tokenize and two sent_tokenize calls) and syllables
+were counted one character at a time. Requires the NLTK punkt data.
+
+Usage: python -m benchmarks.content_tokenization [--words 200000] [--repeat 3]
+"""
+import argparse
+import random
+import time
+from nltk.tokenize import word_tokenize, sent_tokenize
+from src.nltk_resources import ensure_resources
+from src.readability import syllable_counts
+from src.text_document import TextDocument
+
+STOP_WORDS = {'the', 'a', 'an', 'and', 'or', 'of', 'to', 'in', 'is', 'for', 'with', 'on', 'your', 'our'}
+
+VOCABULARY = (
+    'the a and of to in is for with on your our garage service repair brake tyre engine '
+    'oil change inspection quality customer vehicle warranty appointment excellent great '
+    'good poor technician diagnostic electric hybrid maintenance seasonal check price'
+).split()
+
+
+def build_text(word_count):
+    """Generate an article of roughly word_count words"""
+    random.seed(0)
+    sentences = []
+    words = 0
+    while words < word_count:
+        length = random.randint(6, 24)
+        sentence = ' '.join(random.choice(VOCABULARY) for _ in range(length))
+        sentences.append(sentence.capitalize() + random.choice(['.', '.', '!', '?']))
+        words += length
+    return ' '.join(sentences)
+
+
+def count_syllables(text):
+    """The old character-by-character syllable count"""
+    count = 0
+    on_vowel = False
+    for char in text.lower():
+        is_vowel = char in 'aeiouy'
+        if is_vowel and not on_vowel:
+            count += 1
+        on_vowel = is_vowel
+    return count
+
+
+def before(text):
+    """Each analysis tokenizes on its own, as ContentCollector used to"""
+    text_sentences = sent_tokenize(text)
+    text_words = [w for w in word_tokenize(text.lower()) if w.isalnum() and w not in STOP_WORDS]
+    readability_sentences = sent_tokenize(text)
+    readability_words = len([w for w in word_tokenize(text.lower()) if w.isalnum()])
+    syllables = count_syllables(text)
+    keyword_words = [w for w in word_tokenize(text.lower()) if w.isalnum() and w not in STOP_WORDS]
+    sentiment_tokens = len(word_tokenize(text.lower()))
+    return (len(text_sentences), len(text_words), len(readability_sentences), readability_words,
+            syllables, len(keyword_words), sentiment_tokens)
+
+
+def after(text):
+    """All analyses read from one TextDocument"""
+    document = TextDocument(text, STOP_WORDS)
+    return (len(document.sentences), len(document.content_words), len(document.sentences),
+            len(document.words), int(syllable_counts([document.text])[0]), len(document.content_words),
+            len(document.tokens))
+
+
+def timed(fn, text, repeat):
+    """Best wall time of fn(text) over repeat runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    try:
+        # Also puts the project's nltk_data directory on the NLTK path
+        ensure_resources()
+    except LookupError as e:
+        raise SystemExit(str(e))
+
+    text = build_text(args.words)
+    if before(text) != after(text):
+        raise SystemExit("TextDocument results differ from the per-analysis tokenization")
+
+    before_time = timed(before, text, args.repeat)
+    after_time = timed(after, text, args.repeat)
+
+    print(f"Fixture:  {len(text.split())} words, {len(text) / 1024:.0f} KB")
+    print(f"Before:   {before_time * 1000:.1f} ms")
+    print(f"After:    {after_time * 1000:.1f} ms")
+    print(f"Speedup:  {before_time / after_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""Deterministic page corpus and canned third-party API responses for the benchmark suite
+
+The default corpus covers the page shapes that stress the collectors
+differently: a small brochure page, a large catalogue, deeply nested markup
+and an image gallery. A directory of recorded pages (*.html) can be used
+instead with load_corpus().
+"""
+import gzip
+import random
+from pathlib import Path
+from benchmarks.html_features import build_page
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+PARAGRAPH = (
+    'Our garage offers brake repair, tyre changes, oil service and seasonal inspections. '
+    'Every technician is certified and every repair comes with a written warranty. '
+    'Book an appointment online and we will have your vehicle ready the same day. '
+)
+
+
+def small_page():
+    """A short brochure page with complete meta tags"""
+    return (
+        '<html><head><title>Garage Example - Car repair</title><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        '<meta name="description" content="Car repair and maintenance">'
+        '<meta name="keywords" content="garage, repair"><meta name="robots" content="index, follow">'
+        '</head><body><nav role="navigation"><a href="/">Home</a> <a href="/services">Services</a></nav>'
+        '<main role="main"><h1>Car repair you can trust</h1>'
+        + ''.join(f'<h2>Service {i}</h2><p>{PARAGRAPH}</p><img src="/img/{i}.jpg" alt="Service {i}">' for i in range(5))
+        + '<a href="https://partner.example.com/">Partner</a></main></body></html>'
+    )
+
+
+def large_page():
+    """A product catalogue of about 2 MB"""
+    return build_page(2)
+
+
+def nested_page(depth=400):
+    """Content wrapped in hundreds of levels of markup, as page builders produce"""
+    opening = ''.join(f'<div class="wrap-{i}">' for i in range(depth))
+    closing = '</div>' * depth
+    body = ''.join(f'<section><h3>Block {i}</h3><p>{PARAGRAPH}</p></section>' for i in range(20))
+    return (
+        '<html><head><title>Nested layout</title>'
+        '<meta name="viewport" content="width=device-width"></head><body>'
+        f'{opening}<h1>Deeply nested</h1>{body}{closing}</body></html>'
+    )
+
+
+def image_page(count=3000):
+    """A gallery with thousands of images, a third without alt text"""
+    random.seed(1)
+    images = ''.join(
+        f'<figure><img src="/gallery/{i}.jpg" srcset="/gallery/{i}@2x.jpg 2x"'
+        f'{" alt=" + chr(34) + "Photo " + str(i) + chr(34) if random.random() > 0.33 else ""}>'
+        f'<figcaption>Photo {i}</figcaption></figure>'
+        for i in range(count)
+    )
+    return (
+        '<html><head><title>Gallery</title><meta name="description" content="Photo gallery">'
+        f'</head><body><h1>Gallery</h1><h2>Workshop</h2><p>{PARAGRAPH}</p>{images}</body></html>'
+    )
+
+
+def build_corpus():
+    """Page name -> HTML for the default corpus"""
+    return {
+        'small': small_page(),
+        'large': large_page(),
+        'nested': nested_page(),
+        'images': image_page()
+    }
+
+
+def load_corpus(directory):
+    """Page name -> HTML for every *.html file in a directory of recorded pages"""
+    return {
+        path.stem: path.read_text(encoding='utf-8', errors='replace')
+        for path in sorted(Path(directory).glob('*.html'))
+    }
+
+
+def robots_txt(base_url):
+    return (
+        'User-agent: *\nDisallow: /admin\nAllow: /\n\n'
+        'User-agent: Googlebot\nDisallow: /tmp\n\n'
+        f'Sitemap: {base_url}/sitemap.xml\n'
+    )
+
+
+def sitemap_index(base_url, children):
+    entries = ''.join(
+        f'<sitemap><loc>{base_url}/sitemaps/{i}.xml.gz</loc><lastmod>2024-0{1 + i % 9}-01</lastmod></sitemap>'
+        for i in range(children)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="{SITEMAP_NS}">{entries}</sitemapindex>'
+
+
+def sitemap_child(base_url, index, urls):
+    """A gzipped sitemap listing urls pages"""
+    entries = ''.join(
+        f'<url><loc>{base_url}/products/{index}/{i}</loc><lastmod>2024-{1 + i % 12:02d}-{1 + i % 28:02d}</lastmod></url>'
+        for i in range(urls)
+    )
+    xml = f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="{SITEMAP_NS}">{entries}</urlset>'
+    return gzip.compress(xml.encode('utf-8'), mtime=0)
+
+
+W3C_RESPONSE = {
+    'messages': [
+        {'type': 'error', 'message': 'Stray end tag "div".', 'lastLine': 12, 'extract': '</div>'},
+        {'type': 'info', 'subType': 'warning', 'message': 'Section lacks heading.', 'lastLine': 40},
+        {'type': 'warning', 'message': 'Consider adding a lang attribute.', 'lastLine': 1}
+    ]
+}
+
+PAGESPEED_RESPONSE = {
+    'lighthouseResult': {
+        'categories': {'performance': {'score': 0.87}},
+        'audits': {
+            'first-contentful-paint': {'displayValue': '1.2 s'},
+            'speed-index': {'displayValue': '2.1 s'},
+            'interactive': {'displayValue': '3.4 s'}
+        }
+    }
+}
+
+OBSERVATORY_RESPONSE = {'score': 70, 'grade': 'B', 'tests_passed': 9, 'tests_failed': 3}
+
+SSL_INFO = {
+    'valid': True,
+    'issuer': {'organizationName': 'Benchmark CA'},
+    'expiry_date': 'Jan  1 00:00:00 2030 GMT',
+    'version': 3
+}
+
+
+def lighthouse_report():
+    """A Lighthouse JSON report with the audits PerformanceCollector reads"""
+    metrics = {
+        'first-contentful-paint': (0.9, 1200, '1.2 s'),
+        'largest-contentful-paint': (0.7, 2500, '2.5 s'),
+        'total-blocking-time': (0.8, 150, '150 ms'),
+        'cumulative-layout-shift': (0.95, 0.05, '0.05'),
+        'speed-index': (0.85, 2100, '2.1 s'),
+        'render-blocking-resources': (0.5, 300, 'Potential savings of 300 ms'),
+        'unused-javascript': (0.4, 450, 'Potential savings of 120 KiB'),
+        'total-byte-weight': (0.9, 900000, 'Total size was 880 KiB'),
+        'dom-size': (0.8, 1500, '1,500 elements')
+    }
+    return {
+        'categories': {'performance': {'score': 0.82}},
+        'audits': {
+            audit_id: {'title': audit_id, 'description': '', 'score': score, 'numericValue': value, 'displayValue': display}
+            for audit_id, (score, value, display) in metrics.items()
+        }
+    }
@@ -0,0 +1,153 @@
+"""Compare single-pass HtmlFeatures extraction with repeated soup.find_all calls
+
+Builds a large synthetic e-commerce style page, runs the tag selections the
+SEO, technical and content collectors make both ways, checks that they pick
+the same tags and reports the time per page.
+
+Usage: python -m benchmarks.html_features [--size-mb 2] [--repeat 5]
+"""
+import argparse
+import random
+import time
+from bs4 import BeautifulSoup
+from src.html_features import HtmlFeatures
+
+
+def build_page(size_mb):
+    """Generate an HTML page of roughly size_mb megabytes"""
+    random.seed(0)
+    parts = [
+        '<html><head><title>Product catalogue</title><meta charset="utf-8">',
+        '<meta name="viewport" content="width=device-width, initial-scale=1">',
+        '<meta name="description" content="Catalogue"><link rel="stylesheet" media="screen" href="a.css">',
+        '<script type="application/ld+json">{"@type": "Store"}</script></head><body>',
+        '<a href="#main">Skip</a><nav role="navigation"><ul><li><a href="/">Home</a></li></ul></nav>',
+        '<main id="main" role="main"><h1>Catalogue</h1>'
+    ]
+    size = sum(len(part) for part in parts)
+    i = 0
+    while size < size_mb * 1024 * 1024:
+        alt = f' alt="Product {i}"' if random.random() > 0.3 else ''
+        block = (
+            f'<section class="product" itemscope itemtype="https://schema.org/Product">'
+            f'<h{2 + i % 5}>Product {i}</h{2 + i % 5}>'
+            f'<img src="/img/{i}.{random.choice(["jpg", "png", "svg"])}" srcset="/img/{i}@2x.jpg 2x"{alt}>'
+            f'<p>Description of product {i} with <a href="/product/{i}">details</a> and '
+            f'<a href="https://partner{i % 7}.example.com/">partner</a>.</p>'
+            f'<table><tr><td>Price</td><td>{i}.00</td></tr></table>'
+            f'<form><label for="q{i}">Qty</label><input id="q{i}"></form>'
+            f'<ul><li>Feature</li><li>Feature</li></ul><blockquote>Review</blockquote></section>'
+        )
+        parts.append(block)
+        size += len(block)
+        i += 1
+    parts.append('<video src="https://youtube.com/v"></video></main></body></html>')
+    return ''.join(parts)
+
+
+def with_find_all(soup):
+    """The selections the collectors used to make, one find_all per selection"""
+    return {
+        'title': soup.title,
+        'meta': soup.find_all('meta'),
+        'headings': [soup.find_all(f'h{i}') for i in range(1, 7)],
+        'links': soup.find_all('a', href=True),
+        'img': soup.find_all('img'),
+        'viewport': soup.find('meta', attrs={'name': 'viewport'}),
+        'json_ld': soup.find_all('script', type='application/ld+json'),
+        'itemtype': soup.find_all(attrs={"itemtype": True}),
+        'media_links': soup.find_all('link', attrs={'media': True}),
+        'img_alt': soup.find_all('img', alt=True),
+        'img_no_alt': soup.find_all('img', alt=False),
+        'role': soup.find_all(attrs={"role": True}),
+        'label': soup.find_all('label'),
+        'skip': soup.find_all('a', attrs={'href': '#main'}),
+        'structure': [len(soup.find_all(name)) for name in ('p', 'ul', 'ol', 'table', 'blockquote')]
+        + [len(soup.find_all(['section', 'article', 'aside', 'nav']))],
+        'video': soup.find_all(['video', 'iframe[src*="youtube"], iframe[src*="vimeo"]'])
+    }
+
+
+def with_features(soup):
+    """The same selections made from one HtmlFeatures traversal"""
+    features = HtmlFeatures(soup)
+    images = features.all('img')
+    return {
+        'title': features.title,
+        'meta': features.all('meta'),
+        'headings': [features.all(f'h{i}') for i in range(1, 7)],
+        'links': [a for a in features.all('a') if a.has_attr('href')],
+        'img': images,
+        'viewport': features.first('meta', name='viewport'),
+        'json_ld': [s for s in features.all('script') if s.get('type') == 'application/ld+json'],
+        'itemtype': features.with_itemtype,
+        'media_links': [link for link in features.all('link') if link.has_attr('media')],
+        'img_alt': [img for img in images if img.has_attr('alt')],
+        'img_no_alt': [img for img in images if not img.has_attr('alt')],
+        'role': features.with_role,
+        'label': features.all('label'),
+        'skip': [a for a in features.all('a') if a.get('href') == '#main'],
+        'structure': [features.count(name) for name in ('p', 'ul', 'ol', 'table', 'blockquote')]
+        + [features.count('section', 'article', 'aside', 'nav')],
+        'video': features.all('video')
+    }
+
+
+def same_selection(a, b):
+    """Whether two selections contain the same tag objects in the same order"""
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same_selection(x, y) for x, y in zip(a, b))
+    if isinstance(a, int) or a is None:
+        return a == b
+    return a is b
+
+
+def timed(fn, soup, repeat):
+    """Best wall time of fn(soup) over repeat runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(soup)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=float, default=2)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    html = build_page(args.size_mb)
+    start = time.perf_counter()
+    soup = BeautifulSoup(html, 'html.parser')
+    parse_time = time.perf_counter() - start
+
+    lxml_time = None
+    try:
+        start = time.perf_counter()
+        BeautifulSoup(html, 'lxml')
+        lxml_time = time.perf_counter() - start
+    except Exception:
+        pass
+
+    old, new = with_find_all(soup), with_features(soup)
+    mismatched = [key for key in old if not same_selection(old[key], new[key])]
+    if mismatched:
+        raise SystemExit(f"Selections differ for: {', '.join(mismatched)}")
+
+    find_all_time = timed(with_find_all, soup, args.repeat)
+    features_time = timed(with_features, soup, args.repeat)
+
+    print(f"Page size:         {len(html) / 1024 / 1024:.2f} MB")
+    print(f"html.parser parse: {parse_time * 1000:.1f} ms")
+    if lxml_time is not None:
+        print(f"lxml parse:        {lxml_time * 1000:.1f} ms")
+    print(f"find_all calls:    {find_all_time * 1000:.1f} ms")
+    print(f"HtmlFeatures:      {features_time * 1000:.1f} ms")
+    print(f"Speedup:           {find_all_time / features_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
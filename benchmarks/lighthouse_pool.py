@@ -0,0 +1,57 @@
+"""Compare Lighthouse audits with a fresh browser per URL against a warm Chrome pool
+
+Runs the same URLs through PerformanceCollector twice, once spawning Chrome
+for every audit and once against a ChromePool, and reports wall time per
+audit. Requires the lighthouse CLI and Chrome.
+
+Usage: python -m benchmarks.lighthouse_pool URL [URL ...] [--pool-size 2] [--max-audits 20]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.chrome_pool import ChromePool
+from src.collectors.performance_collector import PerformanceCollector
+
+
+def run(collector, urls, workers):
+    """Audit every URL with up to workers audits in flight; returns total seconds"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(collector.collect_data, urls))
+    failed = sum(1 for result in results if result is None)
+    if failed:
+        print(f"  {failed} of {len(urls)} audits failed")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--pool-size', type=int, default=2)
+    parser.add_argument('--max-audits', type=int, default=20)
+    args = parser.parse_args()
+
+    spawn_collector = PerformanceCollector(pool_size=0)
+    spawn_time = run(spawn_collector, args.urls, args.pool_size)
+
+    pooled_collector = PerformanceCollector(pool_size=0)
+    start = time.perf_counter()
+    pooled_collector.pool = ChromePool(size=args.pool_size, max_audits=args.max_audits)
+    warmup_time = time.perf_counter() - start
+    try:
+        pooled_time = run(pooled_collector, args.urls, args.pool_size)
+        stats = pooled_collector.pool.stats()
+    finally:
+        pooled_collector.pool.close()
+
+    count = len(args.urls)
+    print(f"Audits:              {count} with parallelism {args.pool_size}")
+    print(f"Spawn per URL:       {spawn_time:.1f}s total, {spawn_time / count:.2f}s per audit")
+    print(f"Warm pool:           {pooled_time:.1f}s total, {pooled_time / count:.2f}s per audit")
+    print(f"Pool warm-up:        {warmup_time:.1f}s for {args.pool_size} browsers")
+    print(f"Overhead saved:      {(spawn_time - pooled_time) / count:.2f}s per audit")
+    print(f"Browser launches:    {stats['launches']} ({stats['recycles']} recycles)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Readability throughput in documents per second, one page at a time vs. one batch
+
+The per-document path reproduces ContentCollector's former readability
+analysis: word and sentence counts from the TextDocument, syllables with the
+former VOWEL_RUN regular expression and the Flesch formula in plain Python. The
+batch path is src.readability.readability_reports. Both start from
+documents that are already tokenized, since the tokens are shared with the
+other content analyses; --include-tokenization times NLTK tokenization too.
+Requires the NLTK punkt data.
+
+Usage: python -m benchmarks.readability [--documents 5000] [--words 600] [--repeat 3]
+                                        [--include-tokenization]
+"""
+import argparse
+import random
+import re
+import time
+from benchmarks.content_tokenization import VOCABULARY
+from src.nltk_resources import ensure_resources
+from src.readability import VOWELS, readability_reports
+from src.text_document import TextDocument
+
+# The former TextDocument.syllable_count, one regular expression scan per document
+VOWEL_RUN = re.compile(f'[{VOWELS}]+')
+
+
+def build_documents(count, words):
+    """Generate count articles of about words words each, of varying length"""
+    random.seed(0)
+    documents = []
+    for _ in range(count):
+        sentences = []
+        total = 0
+        target = random.randint(words // 2, words * 3 // 2)
+        while total < target:
+            length = random.randint(6, 24)
+            sentence = ' '.join(random.choice(VOCABULARY) for _ in range(length))
+            sentences.append(sentence.capitalize() + random.choice(['.', '.', '!', '?']))
+            total += length
+        documents.append(' '.join(sentences))
+    return documents
+
+
+def per_document(documents):
+    """ContentCollector's former readability analysis, one document at a time"""
+    reports = []
+    for document in documents:
+        if not document.text:
+            reports.append({})
+            continue
+        word_count = len(document.words)
+        sentence_count = len(document.sentences)
+        avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
+        syllable_count = len(VOWEL_RUN.findall(document.text.lower()))
+        avg_syllables_per_word = syllable_count / word_count if word_count > 0 else 0
+        flesch_score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
+        reports.append({
+            'flesch_reading_ease': min(100, max(0, flesch_score)),
+            'avg_sentence_length': avg_sentence_length,
+            'avg_syllables_per_word': avg_syllables_per_word,
+            'complexity_level': _complexity_level(flesch_score)
+        })
+    return reports
+
+
+def _complexity_level(flesch_score):
+    if flesch_score >= 90:
+        return "Very Easy"
+    elif flesch_score >= 80:
+        return "Easy"
+    elif flesch_score >= 70:
+        return "Fairly Easy"
+    elif flesch_score >= 60:
+        return "Standard"
+    elif flesch_score >= 50:
+        return "Fairly Difficult"
+    elif flesch_score >= 30:
+        return "Difficult"
+    return "Very Difficult"
+
+
+def tokenized(texts):
+    """TextDocuments with their words and sentences already computed"""
+    documents = [TextDocument(text, frozenset()) for text in texts]
+    for document in documents:
+        document.words, document.sentences
+    return documents
+
+
+def timed(fn, texts, repeat, include_tokenization):
+    """Best wall time of fn over the documents in repeat runs"""
+    best = None
+    for _ in range(repeat):
+        if include_tokenization:
+            documents = [TextDocument(text, frozenset()) for text in texts]
+        else:
+            documents = tokenized(texts)
+        start = time.perf_counter()
+        fn(documents)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--words', type=int, default=600, help='Average words per document')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--include-tokenization', action='store_true', help='Also time NLTK tokenization')
+    args = parser.parse_args()
+    try:
+        # Also puts the project's nltk_data directory on the NLTK path
+        ensure_resources()
+    except LookupError as e:
+        raise SystemExit(str(e))
+
+    texts = build_documents(args.documents, args.words) + ['']
+    documents = tokenized(texts)
+    if per_document(documents) != readability_reports(documents):
+        raise SystemExit("Batch readability differs from the per-document analysis")
+
+    before_time = timed(per_document, texts, args.repeat, args.include_tokenization)
+    after_time = timed(readability_reports, texts, args.repeat, args.include_tokenization)
+
+    print(f"Fixture:       {len(texts)} documents, {sum(len(text) for text in texts) / 1024 / 1024:.1f} MB")
+    print(f"Per document:  {len(texts) / before_time:,.0f} docs/s")
+    print(f"Batch:         {len(texts) / after_time:,.0f} docs/s")
+    print(f"Speedup:       {before_time / after_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""Local stand-ins for every network dependency of the collectors
+
+StandInServer serves the page corpus, robots.txt and a gzipped sitemap index
+over HTTP/1.1 with ETags, and answers the W3C validator, PageSpeed Insights
+and Mozilla Observatory APIs with canned JSON. stubbed() routes the shared
+HTTP client's third-party API calls to it and replaces the SSL handshake, the
+lighthouse binary and the Llama model, with every cache pointed at a
+temporary directory so each run starts cold.
+"""
+import hashlib
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from benchmarks import fixtures
+
+# Third-party API origin -> path prefix on the stand-in server
+API_ROUTES = {
+    'https://validator.w3.org/': '/w3c/',
+    'https://www.googleapis.com/': '/pagespeed/',
+    'https://http-observatory.security.mozilla.org/': '/observatory/'
+}
+
+
+class StandInServer:
+    """Threaded HTTP server for the corpus and the canned API responses"""
+
+    def __init__(self, corpus, sitemap_children=4, sitemap_urls=5000):
+        self.corpus = corpus
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._httpd.routes = self._build_routes(sitemap_children, sitemap_urls)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def page_urls(self):
+        """Page name -> URL of every page in the corpus"""
+        return {name: f"{self.base_url}/pages/{name}/" for name in self.corpus}
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _build_routes(self, sitemap_children, sitemap_urls):
+        routes = {
+            f'/pages/{name}/': ('text/html; charset=utf-8', html.encode('utf-8'))
+            for name, html in self.corpus.items()
+        }
+        routes['/robots.txt'] = ('text/plain', fixtures.robots_txt(self.base_url).encode('utf-8'))
+        routes['/sitemap.xml'] = (
+            'application/xml', fixtures.sitemap_index(self.base_url, sitemap_children).encode('utf-8')
+        )
+        for i in range(sitemap_children):
+            routes[f'/sitemaps/{i}.xml.gz'] = (
+                'application/gzip', fixtures.sitemap_child(self.base_url, i, sitemap_urls)
+            )
+        routes['/w3c/nu/'] = ('application/json', json.dumps(fixtures.W3C_RESPONSE).encode('utf-8'))
+        routes['/pagespeed/pagespeedonline/v5/runPagespeed'] = (
+            'application/json', json.dumps(fixtures.PAGESPEED_RESPONSE).encode('utf-8')
+        )
+        routes['/observatory/api/v1/analyze'] = (
+            'application/json', json.dumps(fixtures.OBSERVATORY_RESPONSE).encode('utf-8')
+        )
+        return {
+            path: (content_type, body, '"' + hashlib.sha1(body).hexdigest() + '"')
+            for path, (content_type, body) in routes.items()
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self._respond()
+
+    def _respond(self):
+        route = self.server.routes.get(urlsplit(self.path).path)
+        if route is None:
+            self._send(404, 'text/plain', b'not found')
+            return
+        content_type, body, etag = route
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._send(200, content_type, body, etag)
+
+    def _send(self, status, content_type, body, etag=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _RedirectAdapter(HTTPAdapter):
+    """Send requests for a third-party origin to a path on the stand-in server"""
+
+    def __init__(self, origin, target):
+        super().__init__()
+        self.origin = origin
+        self.target = target
+
+    def send(self, request, **kwargs):
+        request.url = self.target + request.url[len(self.origin):]
+        return super().send(request, **kwargs)
+
+
+class FakeLlama:
+    """Stand-in for llama_cpp.Llama returning fixed text with plausible usage counts
+
+    ms_per_token simulates generation time so LLM-bound changes stay visible.
+    """
+
+    def __init__(self, ms_per_token=0.0):
+        self.ms_per_token = ms_per_token
+
+    def create_completion(self, prompt, max_tokens=200, **params):
+        completion_tokens = min(max_tokens, 60)
+        if self.ms_per_token:
+            time.sleep(completion_tokens * self.ms_per_token / 1000)
+        return {
+            'choices': [{'text': 'Focus on the highest-impact fixes first. <end>'}],
+            'usage': {'prompt_tokens': len(prompt) // 4, 'completion_tokens': completion_tokens}
+        }
+
+
+@contextmanager
+def stubbed(server, llm_ms_per_token=0.0):
+    """Route every network dependency to the stand-ins for the duration of the block"""
+    from src.completion_cache import CompletionCache
+    from src.host_cache import HostCache
+    from src.http_cache import http_cache
+    from src.http_client import http_client
+    import src.collectors.performance_collector as performance_collector
+    import src.collectors.seo_collector as seo_collector
+    import src.collectors.technical_collector as technical_collector
+    import src.llm_batch as llm_batch
+
+    with ExitStack() as stack:
+        tmp = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix='seo-bench-')))
+
+        for origin, prefix in API_ROUTES.items():
+            http_client.session.mount(origin, _RedirectAdapter(origin, server.base_url + prefix))
+        stack.callback(lambda: [http_client.session.adapters.pop(origin, None) for origin in API_ROUTES])
+
+        stack.enter_context(mock.patch.object(http_cache, 'cache_dir', tmp / 'http'))
+        stack.enter_context(mock.patch.object(http_cache, '_size', None))
+        (tmp / 'http').mkdir()
+        stack.enter_context(mock.patch.object(technical_collector, 'host_cache', HostCache(tmp / 'hosts.sqlite')))
+        stack.enter_context(mock.patch.object(
+            technical_collector.TechnicalCollector, '_check_ssl', lambda self, url: dict(fixtures.SSL_INFO)
+        ))
+
+        llm = FakeLlama(llm_ms_per_token)
+        stack.enter_context(mock.patch.object(seo_collector, 'get_model', lambda *args, **kwargs: llm))
+        stack.enter_context(mock.patch.object(llm_batch, 'get_model', lambda *args, **kwargs: llm))
+        completion_cache = CompletionCache(tmp / 'completions.sqlite')
+        stack.enter_context(mock.patch.object(
+            seo_collector, 'CompletionCache', lambda *args, **kwargs: completion_cache
+        ))
+
+        lighthouse = _fake_lighthouse(tmp)
+        stack.enter_context(mock.patch.dict(os.environ, {'PATH': f"{lighthouse.parent}{os.pathsep}{os.environ['PATH']}"}))
+        performance_collector._find_lighthouse.cache_clear()
+        stack.callback(performance_collector._find_lighthouse.cache_clear)
+
+        yield tmp
+
+
+def _fake_lighthouse(tmp):
+    """Write an executable that mimics `lighthouse URL --output-path=FILE`"""
+    report_path = tmp / 'lighthouse-report.json'
+    report_path.write_text(json.dumps(fixtures.lighthouse_report()))
+    script = tmp / 'bin' / 'lighthouse'
+    script.parent.mkdir()
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import shutil, sys\n"
+        "output = [a.split('=', 1)[1] for a in sys.argv if a.startswith('--output-path=')][0]\n"
+        f"shutil.copyfile({str(report_path)!r}, output)\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return script
@@ -0,0 +1,93 @@
+"""Guard CLI cold start: time `main.py --help` and ReportGenerator construction
+
+Each run starts a new Python process that either runs main.py with --help,
+covering main.py's own imports and argument handling, or imports
+ReportGenerator and builds it with the requested collectors. It reports the
+wall time and which heavy modules ended up imported. Exits non-zero if the
+best time of either exceeds --max-ms, if --help imported any heavy module, or
+if construction imported one the chosen collectors do not need.
+
+Usage: python -m benchmarks.startup [--collectors seo,technical] [--runs 5] [--max-ms 1000]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Heavy modules and the collector that is allowed to import each one
+HEAVY_MODULES = {
+    'llama_cpp': None,
+    'numpy': 'content',
+    'nltk': 'content',
+    'trafilatura': 'content',
+    'google.analytics.data_v1beta': 'google',
+    'googleapiclient': 'google'
+}
+
+CLI_PROBE = """
+import contextlib, io, json, runpy, sys, time
+start = time.perf_counter()
+sys.argv = ['main.py', '--help']
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        runpy.run_path('main.py', run_name='__main__')
+    except SystemExit:
+        pass
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+GENERATOR_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from src.report_generator import ReportGenerator
+ReportGenerator({names!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(template, names=None):
+    """Run one cold start in a subprocess and return its JSON result"""
+    code = template.format(names=names, heavy=list(HEAVY_MODULES))
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--collectors', default='seo')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=1000)
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.collectors.split(',') if name.strip()]
+    print(f"Collectors:      {', '.join(names)} (budget {args.max_ms:.0f} ms, best of {args.runs} runs)")
+
+    failures = []
+    # --help constructs no collector, so it may import no heavy module at all
+    for label, template, allowed in [
+        ('main.py --help', CLI_PROBE, []),
+        ('ReportGenerator', GENERATOR_PROBE, names)
+    ]:
+        results = [probe(template, names) for _ in range(args.runs)]
+        best = min(result['seconds'] for result in results) * 1000
+        imported = results[0]['modules']
+        unexpected = [m for m in imported if HEAVY_MODULES[m] not in allowed]
+        print(f"{label + ':':<16} {best:.0f} ms; heavy modules: {', '.join(imported) or 'none'}")
+
+        if best > args.max_ms:
+            failures.append(f"{label} cold start {best:.0f} ms exceeds {args.max_ms:.0f} ms")
+        if unexpected:
+            failures.append(f"{label} imported modules it does not need: {', '.join(unexpected)}")
+    if failures:
+        raise SystemExit('Regression: ' + '; '.join(failures))
+
+
+if __name__ == '__main__':
+    main()
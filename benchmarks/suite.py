@@ -0,0 +1,177 @@
+"""Reproducible collector benchmarks against a local stand-in of the web
+
+Serves the fixture corpus (or a directory of recorded pages) from a local
+HTTP server, stubs the W3C, PageSpeed and Observatory APIs, the SSL check,
+Lighthouse and the Llama model, then measures per-page latency (p50/p95),
+throughput and peak traced memory of SEOCollector, TechnicalCollector,
+ContentCollector and a full ReportGenerator.generate_report. Results are
+compared with a stored baseline; --check exits non-zero on a regression
+beyond --tolerance.
+
+ContentCollector is skipped when trafilatura or the NLTK data is missing.
+
+Usage: python -m benchmarks.suite [--targets seo,technical,content,report] [--repeat 3]
+                                  [--corpus DIR] [--llm-ms-per-token 0]
+                                  [--baseline benchmarks/baseline.json] [--save-baseline] [--check]
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+from benchmarks import fixtures
+from benchmarks.standin import StandInServer, stubbed
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+TARGETS = ['seo', 'technical', 'content', 'report']
+
+# Metric -> whether a higher value is better
+METRICS = {
+    'p50_ms': False,
+    'p95_ms': False,
+    'pages_per_second': True,
+    'peak_memory_mb': False
+}
+
+
+def make_target(name):
+    """Return a function analyzing one URL, or raise if the target cannot run here"""
+    if name == 'seo':
+        from src.collectors.seo_collector import SEOCollector
+        return SEOCollector().collect_data
+    if name == 'technical':
+        from src.collectors.technical_collector import TechnicalCollector
+        return TechnicalCollector().collect_data
+    if name == 'content':
+        import trafilatura  # noqa: F401
+        from src.collectors.content_collector import ContentCollector
+        return ContentCollector().collect_data
+    if name == 'report':
+        from src.report_generator import ReportGenerator
+        names = ['seo', 'technical', 'performance']
+        try:
+            make_target('content')
+            names.append('content')
+        except Exception:
+            pass
+        generator = ReportGenerator(names)
+        return lambda url: generator.generate_report(url, reuse_unchanged=False)
+    raise ValueError(f"Unknown target: {name}")
+
+
+def percentile(values, q):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def measure(analyze, urls, repeat):
+    """Time analyze over every URL repeat times, then trace one pass for peak memory"""
+    # Warm-up pass: imports, lazily built state and the HTTP cache
+    for url in urls.values():
+        analyze(url)
+
+    latencies = []
+    per_page = {name: [] for name in urls}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, url in urls.items():
+            page_start = time.perf_counter()
+            analyze(url)
+            elapsed = (time.perf_counter() - page_start) * 1000
+            latencies.append(elapsed)
+            per_page[name].append(elapsed)
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for url in urls.values():
+        analyze(url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'pages': len(latencies),
+        'p50_ms': round(percentile(latencies, 0.5), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'pages_per_second': round(len(latencies) / total, 2),
+        'peak_memory_mb': round(peak / 1024 / 1024, 2),
+        'per_page_p50_ms': {name: round(percentile(values, 0.5), 2) for name, values in per_page.items()}
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print each metric against the baseline; returns the regressions beyond tolerance"""
+    regressions = []
+    print(f"\n{'target':<10} {'metric':<17} {'current':>10} {'baseline':>10} {'change':>8}")
+    for target, metrics in results.items():
+        if 'skipped' in metrics:
+            print(f"{target:<10} skipped: {metrics['skipped']}")
+            continue
+        for metric, higher_is_better in METRICS.items():
+            current = metrics[metric]
+            previous = baseline.get(target, {}).get(metric)
+            if not previous:
+                print(f"{target:<10} {metric:<17} {current:>10} {'-':>10} {'':>8}")
+                continue
+            change = (current - previous) / previous
+            worse = -change if higher_is_better else change
+            flag = ' !' if worse > tolerance else ''
+            print(f"{target:<10} {metric:<17} {current:>10} {previous:>10} {change:>+7.1%}{flag}")
+            if worse > tolerance:
+                regressions.append(f"{target} {metric} {change:+.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--targets', default=','.join(TARGETS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--corpus', help='Directory of recorded *.html pages to serve instead of the fixtures')
+    parser.add_argument('--llm-ms-per-token', type=float, default=0.0, help='Simulated Llama generation time')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--check', action='store_true', help='Exit non-zero on a regression beyond --tolerance')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative slowdown, 0.25 = 25%%')
+    args = parser.parse_args()
+
+    corpus = fixtures.load_corpus(args.corpus) if args.corpus else fixtures.build_corpus()
+    targets = [name.strip() for name in args.targets.split(',') if name.strip()]
+    print(f"Corpus: {', '.join(f'{name} ({len(html) // 1024} KB)' for name, html in corpus.items())}")
+
+    results = {}
+    with StandInServer(corpus) as server, stubbed(server, args.llm_ms_per_token):
+        urls = server.page_urls()
+        for name in targets:
+            try:
+                analyze = make_target(name)
+            except Exception as e:
+                results[name] = {'skipped': f"{type(e).__name__}: {e}"}
+                continue
+            print(f"Measuring {name}...")
+            # Collectors report progress and errors with print; keep the table readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[name] = measure(analyze, urls, args.repeat)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    regressions = compare(results, baseline.get('results', {}), args.tolerance)
+
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps({
+            'machine': f"{platform.machine()} {platform.python_implementation()} {platform.python_version()}",
+            'corpus': sorted(corpus),
+            'repeat': args.repeat,
+            'results': {name: metrics for name, metrics in results.items() if 'skipped' not in metrics}
+        }, indent=2) + '\n')
+        print(f"\nBaseline saved to {baseline_path}")
+
+    if args.check and regressions:
+        raise SystemExit('Regression: ' + '; '.join(regressions))
+
+
+if __name__ == '__main__':
+    main()
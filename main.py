@@ -1,27 +1,117 @@
 from src.report_generator import ReportGenerator
+from src.report_events import NdjsonEventWriter
+from src.seo_scoring import parse_weights
+from pathlib import Path
 import sys
 import argparse
 
+def read_urls(source):
+    """Read one URL per line from a file or stdin, skipping blanks and comments"""
+    f = sys.stdin if source == '-' else open(source, encoding='utf-8')
+    try:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
 def main():
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Generate website analysis report')
-    parser.add_argument('url', help='URL to analyze (e.g., https://example.com)')
+    parser.add_argument('url', nargs='?', help='URL to analyze (e.g., https://example.com)')
     parser.add_argument('--google-id', help='Google Analytics property ID (optional)', default=None)
-    
+    parser.add_argument('--batch', metavar='FILE', help="File with one URL per line, or '-' to read from stdin")
+    parser.add_argument('--workers', type=int, default=4, help='Maximum number of sites (or pages in crawl mode) analyzed at once')
+    parser.add_argument('--per-host', type=int, default=2, help='Maximum number of concurrent analyses per host in batch mode')
+    parser.add_argument('--crawl', action='store_true', help='Crawl internal links from the URL and build a site-level report')
+    parser.add_argument('--max-depth', type=int, default=3, help='Maximum link depth from the start page in crawl mode')
+    parser.add_argument('--max-pages', type=int, default=500, help='Maximum number of pages analyzed in crawl mode')
+    parser.add_argument('--collectors', help='Comma-separated collectors to run (seo, content, performance, technical, google)')
+    parser.add_argument('--collector-timeout', type=float, default=None, help='Seconds to wait for each collector before recording it as missing')
+    parser.add_argument('--stream', metavar='FILE', help="Append report sections as NDJSON events to FILE as they finish, or '-' for stdout")
+    parser.add_argument('--measure-sequential', action='store_true', help='In batch mode, also replay the LLM prompts one at a time to report the batching speedup')
+    parser.add_argument('--no-llm', action='store_true', help='Compute SEO scores without the LLM conclusion, never loading the model')
+    parser.add_argument('--weights', help='Overall SEO score weights, e.g. meta_tags=0.3,images=0.1 (others keep their defaults; the total must be 1)')
+    parser.add_argument('--keyword-index', metavar='FILE', help='Add the content of analyzed pages to this site-wide keyword index (.npz), creating it if needed')
+    parser.add_argument('--no-reuse', action='store_true', help='Re-run every collector even if the page is unchanged since its last stored report')
+
     # Parse arguments
     args = parser.parse_args()
-    
+    if not args.url and not args.batch:
+        parser.error('either a URL or --batch is required')
+    if args.workers < 1 or args.per_host < 1:
+        parser.error('--workers and --per-host must be at least 1')
+
+    on_event = None
+    if args.stream:
+        on_event = NdjsonEventWriter(args.stream)
+        if args.stream == '-':
+            # Keep progress messages out of the event stream
+            sys.stdout = sys.stderr
+
     # Initialize the report generator
-    generator = ReportGenerator()
-    
+    collector_names = None
+    if args.collectors:
+        collector_names = [name.strip() for name in args.collectors.split(',') if name.strip()]
+    try:
+        score_weights = parse_weights(args.weights) if args.weights else None
+        keyword_index = None
+        if args.keyword_index:
+            from src.keyword_index import KeywordIndex
+            keyword_index = KeywordIndex.load(args.keyword_index) if Path(args.keyword_index).exists() else KeywordIndex()
+        generator = ReportGenerator(
+            collector_names, llm=not args.no_llm, score_weights=score_weights, keyword_index=keyword_index
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    except LookupError as e:
+        # NLTK data for the content collector is missing; the message says how to install it
+        sys.exit(str(e))
+    if keyword_index is not None and 'content' not in generator.collector_names:
+        parser.error('--keyword-index needs the content collector, e.g. --collectors seo,content')
+
+    if args.batch:
+        urls = read_urls(args.batch)
+        print(f"Starting batch analysis of {len(urls)} URLs")
+        reports, summary = generator.generate_reports(
+            urls, args.google_id, max_workers=args.workers, per_host=args.per_host,
+            measure_sequential=args.measure_sequential, collector_timeout=args.collector_timeout, reuse_unchanged=not args.no_reuse, on_event=on_event
+        )
+        for report in reports:
+            if report is not None:
+                print(f"Report saved to: {generator.save_report(report)}")
+        print(f"Metrics written to: {generator.write_metrics(reports, summary=summary)}")
+        print(f"Summary saved to: {generator.save_summary(summary)}")
+        if keyword_index is not None:
+            print(f"Keyword index saved to: {keyword_index.save(args.keyword_index)} ({len(keyword_index)} pages)")
+        print(f"Analyzed {len(urls)} URLs in {summary['wall_seconds']}s ({summary['pages_per_minute']} pages/minute)")
+        if summary['llm_batch'] and summary['llm_batch']['speedup']:
+            print(f"LLM batch: {summary['llm_batch']['tokens_per_second']} tokens/s, "
+                  f"{summary['llm_batch']['speedup']}x the sequential path")
+        return
+
+    if args.crawl:
+        print(f"Starting crawl of: {args.url}")
+        report = generator.crawl_site(
+            args.url, max_depth=args.max_depth, max_pages=args.max_pages, max_workers=args.workers
+        )
+        print(f"Crawled {report['crawl']['pages_crawled']} pages in {report['crawl']['wall_seconds']}s")
+        print(f"Report saved to: {generator.save_report(report)}")
+        return
+
     print(f"Starting analysis for: {args.url}")
-    
+
     # Generate report
-    report = generator.generate_report(args.url, args.google_id)
-    
+    report = generator.generate_report(
+        args.url, args.google_id, collector_timeout=args.collector_timeout, reuse_unchanged=not args.no_reuse,
+        on_event=on_event
+    )
+
     # Save report to file
     filepath = generator.save_report(report)
     print(f"Report saved to: {filepath}")
+    print(f"Metrics written to: {generator.write_metrics([report])}")
+    if keyword_index is not None:
+        print(f"Keyword index saved to: {keyword_index.save(args.keyword_index)} ({len(keyword_index)} pages)")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
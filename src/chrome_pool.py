@@ -0,0 +1,197 @@
+import atexit
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+import requests
+
+CHROME_CANDIDATES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+
+def find_chrome():
+    """Locate a Chrome binary, honouring CHROME_PATH like Lighthouse does"""
+    if os.getenv('CHROME_PATH'):
+        return os.getenv('CHROME_PATH')
+    for name in CHROME_CANDIDATES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise FileNotFoundError("Chrome not found. Install Chrome or set CHROME_PATH.")
+
+
+class _Browser:
+    """One headless Chrome listening on a remote debugging port"""
+
+    def __init__(self, chrome_path, startup_timeout):
+        self.port = _free_port()
+        self.user_data_dir = tempfile.mkdtemp(prefix='lighthouse-chrome-')
+        self.audits = 0
+        self.process = subprocess.Popen(
+            [
+                chrome_path,
+                '--headless',
+                f'--remote-debugging-port={self.port}',
+                f'--user-data-dir={self.user_data_dir}',
+                '--no-first-run',
+                '--no-default-browser-check',
+                '--disable-gpu'
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        self._wait_until_ready(startup_timeout)
+
+    def _wait_until_ready(self, timeout):
+        """Block until the DevTools endpoint answers"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Chrome exited during startup with code {self.process.returncode}")
+            try:
+                requests.get(f'http://127.0.0.1:{self.port}/json/version', timeout=1)
+                return
+            except requests.RequestException:
+                time.sleep(0.1)
+        self.stop()
+        raise TimeoutError(f"Chrome did not start within {timeout}s")
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def stop(self):
+        """Terminate Chrome and remove its profile directory"""
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+class ChromePool:
+    """A fixed number of warm headless Chrome instances shared by Lighthouse audits
+
+    Audits borrow a browser with `with pool.browser() as port:` and pass the
+    port to `lighthouse --port`. At most `size` audits run at once; a browser
+    is replaced after max_audits audits, if it has died, or if an audit on it
+    raised (a timed-out audit may leave it wedged), to bound memory growth.
+
+    Browsers are launched by the first audits that need them, so creating the
+    pool never fails. A slot without a browser, not launched yet or whose
+    launch failed, is an empty placeholder launched by the next audit that
+    takes it.
+    """
+
+    def __init__(self, size=2, max_audits=20, chrome_path=None, startup_timeout=30):
+        self.size = size
+        self.max_audits = max_audits
+        self.chrome_path = chrome_path or find_chrome()
+        self.startup_timeout = startup_timeout
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.launches = 0
+        self.recycles = 0
+        self.audits = 0
+        self.audit_seconds = 0.0
+
+        for _ in range(size):
+            self._idle.put(None)
+
+    @contextmanager
+    def browser(self):
+        """Borrow a browser for one audit and yield its debugging port"""
+        browser = self._idle.get()
+        if browser is None or not browser.alive():
+            if browser is not None:
+                browser.stop()
+            try:
+                browser = self._launch()
+            except Exception:
+                # Give the slot back so waiting audits are not blocked forever
+                self._idle.put(None)
+                raise
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield browser.port
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            browser.audits += 1
+            with self._lock:
+                self.audits += 1
+                self.audit_seconds += elapsed
+                closed = self._closed
+            if closed:
+                browser.stop()
+            else:
+                if failed or browser.audits >= self.max_audits or not browser.alive():
+                    browser.stop()
+                    try:
+                        browser = self._launch()
+                    except Exception as e:
+                        print(f"Error relaunching Chrome: {str(e)}")
+                        browser = None
+                    with self._lock:
+                        self.recycles += 1
+                self._idle.put(browser)
+
+    def stats(self):
+        """Launch, recycle and audit counters"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'max_audits': self.max_audits,
+                'launches': self.launches,
+                'recycles': self.recycles,
+                'audits': self.audits,
+                'avg_audit_seconds': round(self.audit_seconds / self.audits, 3) if self.audits else None
+            }
+
+    def close(self):
+        """Stop every idle browser; browsers in use stop when returned"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if browser is not None:
+                browser.stop()
+
+    def _launch(self):
+        browser = _Browser(self.chrome_path, self.startup_timeout)
+        with self._lock:
+            self.launches += 1
+        return browser
+
+
+def _free_port():
+    """Ask the OS for an unused local TCP port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_pool(size, max_audits):
+    """The process-wide pool, started on first use"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ChromePool(size=size, max_audits=max_audits)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
@@ -0,0 +1,43 @@
+import importlib
+from pathlib import Path
+
+# Collector name -> (module, class). Modules are only imported when the
+# collector is enabled, so unused SDKs (llama_cpp, nltk, trafilatura, the
+# Google clients) are never loaded.
+COLLECTORS = {
+    'seo': ('src.collectors.seo_collector', 'SEOCollector'),
+    'content': ('src.collectors.content_collector', 'ContentCollector'),
+    'performance': ('src.collectors.performance_collector', 'PerformanceCollector'),
+    'technical': ('src.collectors.technical_collector', 'TechnicalCollector'),
+    'google': ('src.collectors.google_collector', 'GoogleCollector')
+}
+
+DEFAULT_COLLECTORS = ['seo']
+
+GOOGLE_CREDENTIALS_PATH = Path("credentials/google-credentials.json")
+
+
+def default_collector_names():
+    """Collectors enabled when none are requested explicitly"""
+    names = list(DEFAULT_COLLECTORS)
+    # Only enable the Google collector if credentials exist
+    if GOOGLE_CREDENTIALS_PATH.exists():
+        names.append('google')
+    return names
+
+
+def validate_names(names):
+    """Raise ValueError if any name is not a registered collector"""
+    unknown = [name for name in names if name not in COLLECTORS]
+    if unknown:
+        raise ValueError(
+            f"Unknown collectors: {', '.join(unknown)}. "
+            f"Available: {', '.join(COLLECTORS)}"
+        )
+
+
+def create_collector(name):
+    """Import the collector's module and instantiate it"""
+    module_name, class_name = COLLECTORS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
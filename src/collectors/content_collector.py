@@ -1,95 +1,79 @@
-import requests
-from bs4 import BeautifulSoup
 from collections import Counter
 import re
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
+import time
 from nltk.tag import pos_tag
-import nltk
 from urllib.parse import urljoin
-import trafilatura
-import ssl
-from pathlib import Path
+from src.nltk_resources import english_stop_words
+from src.http_client import USER_AGENT
+from src.page_snapshot import PageSnapshot
+from src.readability import readability_reports
+from src.text_document import TextDocument
+from src.tracing import span
 
 class ContentCollector:
     def __init__(self):
-        # Fix SSL certificate verification for NLTK downloads
-        try:
-            _create_unverified_https_context = ssl._create_unverified_context
-        except AttributeError:
-            pass
-        else:
-            ssl._create_default_https_context = _create_unverified_https_context
-
-        # Download all required NLTK data
-        required_packages = [
-            'punkt',
-            'averaged_perceptron_tagger',
-            'stopwords',
-            'punkt/PY3/english.pickle'
-        ]
-
-        for package in required_packages:
-            try:
-                nltk.download(package, quiet=True)
-            except Exception as e:
-                print(f"Error downloading NLTK package {package}: {str(e)}")
+        start = time.perf_counter()
 
-        # Create custom punkt_tab if needed
-        punkt_tab_dir = Path(nltk.data.find('tokenizers/punkt')).parent / 'punkt_tab' / 'english'
-        punkt_tab_dir.mkdir(parents=True, exist_ok=True)
-        
-        if not (punkt_tab_dir / 'punkt.tab').exists():
-            # Create a basic punkt.tab file
-            with open(punkt_tab_dir / 'punkt.tab', 'w') as f:
-                f.write(".\t.\tABBR\n")
-
-        self.stop_words = set(nltk.corpus.stopwords.words('english'))
+        # NLTK data is installed once with `python -m src.nltk_resources`;
+        # this only checks the local copy and fails fast if it is missing
+        self.stop_words = english_stop_words()
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': USER_AGENT
         }
+        # When set to a KeywordIndex, every analyzed page is added to it
+        self.keyword_index = None
+
+        self.startup_seconds = time.perf_counter() - start
+        print(f"ContentCollector ready in {self.startup_seconds * 1000:.0f} ms")
 
-    def collect_data(self, url):
+    def collect_data(self, url, snapshot=None):
         """Collect and analyze content from the website"""
         try:
+            if snapshot is None:
+                snapshot = PageSnapshot(url, self.headers)
+
             # Get main content using trafilatura (better at extracting main content)
-            downloaded = trafilatura.fetch_url(url)
-            main_content = trafilatura.extract(downloaded, include_links=True, include_images=True)
+            main_content = snapshot.main_text
             
             # Get full HTML for additional analysis
-            response = requests.get(url, headers=self.headers)
+            response = snapshot.response
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            features = snapshot.features
+            
+            # Tokenize once and share the tokens between the text analyses
+            document = TextDocument(main_content, self.stop_words)
             
+            with span('content.nltk'):
+                text_analysis = self._analyze_text(document)
+                readability = self._analyze_readability(document)
+                keyword_analysis = self._analyze_keywords(document)
+                sentiment_scores = self._analyze_sentiment(document)
+                if self.keyword_index is not None and document.text:
+                    self.keyword_index.add_page(url, document.content_words)
+
             content_data = {
                 'main_content': main_content,
-                'text_analysis': self._analyze_text(main_content),
-                'readability': self._analyze_readability(main_content),
-                'keyword_analysis': self._analyze_keywords(main_content),
-                'structure_analysis': self._analyze_structure(soup),
-                'media_analysis': self._analyze_media(soup, url),
-                'sentiment_scores': self._analyze_sentiment(main_content)
+                'text_analysis': text_analysis,
+                'readability': readability,
+                'keyword_analysis': keyword_analysis,
+                'structure_analysis': self._analyze_structure(features),
+                'media_analysis': self._analyze_media(features, url),
+                'sentiment_scores': sentiment_scores
             }
             
             return content_data
         except Exception as e:
+            # None, as SEOCollector, so a failed run is never reused as the page's content
             print(f"Error in content collection: {str(e)}")
-            return {
-                'text_content': '',
-                'word_count': 0,
-                'readability_scores': {},
-                'sentiment_analysis': {},
-                'keywords': []
-            }
+            return None
 
-    def _analyze_text(self, text):
+    def _analyze_text(self, document):
         """Analyze text content"""
-        if not text:
+        if not document.text:
             return {}
             
-        sentences = sent_tokenize(text)
-        words = word_tokenize(text.lower())
-        words = [word for word in words if word.isalnum() and word not in self.stop_words]
+        sentences = document.sentences
+        words = document.content_words
         
         return {
             'word_count': len(words),
@@ -99,38 +83,16 @@ class ContentCollector:
             'lexical_density': len(set(words)) / len(words) if words else 0
         }
 
-    def _analyze_readability(self, text):
+    def _analyze_readability(self, document):
         """Calculate readability metrics"""
-        if not text:
-            return {}
-            
-        sentences = sent_tokenize(text)
-        words = word_tokenize(text.lower())
-        word_count = len([word for word in words if word.isalnum()])
-        sentence_count = len(sentences)
-        
-        # Simplified Flesch Reading Ease score
-        avg_sentence_length = word_count / sentence_count if sentence_count > 0 else 0
-        syllable_count = self._count_syllables(text)
-        avg_syllables_per_word = syllable_count / word_count if word_count > 0 else 0
-        
-        flesch_score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
-        
-        return {
-            'flesch_reading_ease': min(100, max(0, flesch_score)),  # Clamp between 0 and 100
-            'avg_sentence_length': avg_sentence_length,
-            'avg_syllables_per_word': avg_syllables_per_word,
-            'complexity_level': self._get_complexity_level(flesch_score)
-        }
+        return readability_reports([document])[0]
 
-    def _analyze_keywords(self, text):
+    def _analyze_keywords(self, document):
         """Extract and analyze keywords"""
-        if not text:
+        if not document.text:
             return {}
             
-        # Tokenize and clean words
-        words = word_tokenize(text.lower())
-        words = [word for word in words if word.isalnum() and word not in self.stop_words]
+        words = document.content_words
         
         # Get word frequencies
         word_freq = Counter(words)
@@ -149,23 +111,25 @@ class ContentCollector:
             'parts_of_speech': Counter(tag for word, tag in pos_tags)
         }
 
-    def _analyze_structure(self, soup):
+    def _analyze_structure(self, features):
         """Analyze content structure"""
         return {
-            'paragraphs': len(soup.find_all('p')),
+            'paragraphs': features.count('p'),
             'lists': {
-                'ul': len(soup.find_all('ul')),
-                'ol': len(soup.find_all('ol'))
+                'ul': features.count('ul'),
+                'ol': features.count('ol')
             },
-            'tables': len(soup.find_all('table')),
-            'blockquotes': len(soup.find_all('blockquote')),
-            'sections': len(soup.find_all(['section', 'article', 'aside', 'nav']))
+            'tables': features.count('table'),
+            'blockquotes': features.count('blockquote'),
+            'sections': features.count('section', 'article', 'aside', 'nav')
         }
 
-    def _analyze_media(self, soup, base_url):
+    def _analyze_media(self, features, base_url):
         """Analyze media content"""
-        images = soup.find_all('img')
-        videos = soup.find_all(['video', 'iframe[src*="youtube"], iframe[src*="vimeo"]'])
+        images = features.all('img')
+        # find_all(['video', 'iframe[src*=...]']) only ever matched <video>,
+        # since find_all compares tag names rather than CSS selectors
+        videos = features.all('video')
         
         return {
             'images': {
@@ -179,9 +143,9 @@ class ContentCollector:
             }
         }
 
-    def _analyze_sentiment(self, text):
+    def _analyze_sentiment(self, document):
         """Basic sentiment analysis"""
-        if not text:
+        if not document.text:
             return {}
             
         # This is a very basic sentiment analysis
@@ -189,7 +153,7 @@ class ContentCollector:
         positive_words = set(['good', 'great', 'awesome', 'excellent', 'happy', 'best'])
         negative_words = set(['bad', 'poor', 'terrible', 'worst', 'unhappy', 'disappointing'])
         
-        words = word_tokenize(text.lower())
+        words = document.tokens
         
         positive_count = sum(1 for word in words if word in positive_words)
         negative_count = sum(1 for word in words if word in negative_words)
@@ -201,38 +165,6 @@ class ContentCollector:
             'neutral_ratio': (total_count - positive_count - negative_count) / total_count if total_count > 0 else 0
         }
 
-    def _count_syllables(self, text):
-        """Rough syllable count for English text"""
-        text = text.lower()
-        count = 0
-        vowels = 'aeiouy'
-        on_vowel = False
-        
-        for char in text:
-            is_vowel = char in vowels
-            if is_vowel and not on_vowel:
-                count += 1
-            on_vowel = is_vowel
-            
-        return count
-
-    def _get_complexity_level(self, flesch_score):
-        """Convert Flesch score to complexity level"""
-        if flesch_score >= 90:
-            return "Very Easy"
-        elif flesch_score >= 80:
-            return "Easy"
-        elif flesch_score >= 70:
-            return "Fairly Easy"
-        elif flesch_score >= 60:
-            return "Standard"
-        elif flesch_score >= 50:
-            return "Fairly Difficult"
-        elif flesch_score >= 30:
-            return "Difficult"
-        else:
-            return "Very Difficult"
-
     def _get_image_type(self, src):
         """Get image type from src"""
         if not src:
@@ -1,21 +1,47 @@
-import requests
 import json
 from pathlib import Path
 import subprocess
 import tempfile
 import os
+import shutil
+import time
+from functools import lru_cache
+from dotenv import load_dotenv
+from src.chrome_pool import get_shared_pool
+from src.tracing import span
+
+load_dotenv()
+
+# Keep this many headless Chromes warm for audits; 0 starts a fresh browser
+# for every URL, as Lighthouse does on its own
+LIGHTHOUSE_POOL_SIZE = int(os.getenv('LIGHTHOUSE_POOL_SIZE', 0))
+# Replace a pooled browser after this many audits
+LIGHTHOUSE_MAX_AUDITS = int(os.getenv('LIGHTHOUSE_MAX_AUDITS', 20))
+# Seconds before a Lighthouse run is killed and the page recorded as failed
+LIGHTHOUSE_TIMEOUT = float(os.getenv('LIGHTHOUSE_TIMEOUT', 120))
+
+@lru_cache(maxsize=None)
+def _find_lighthouse():
+    """Locate the lighthouse CLI once per process"""
+    path = shutil.which('lighthouse')
+    if path is None:
+        print("Lighthouse not found. Please install with: npm install -g lighthouse")
+        print("Make sure you have Node.js installed first.")
+        raise FileNotFoundError("lighthouse")
+    return path
 
 class PerformanceCollector:
-    def __init__(self):
+    def __init__(self, pool_size=LIGHTHOUSE_POOL_SIZE, max_audits=LIGHTHOUSE_MAX_AUDITS, timeout=LIGHTHOUSE_TIMEOUT):
         # Check if lighthouse is installed
-        try:
-            subprocess.run(['lighthouse', '--version'], 
-                         capture_output=True, 
-                         text=True)
-        except FileNotFoundError:
-            print("Lighthouse not found. Please install with: npm install -g lighthouse")
-            print("Make sure you have Node.js installed first.")
-            raise
+        self.lighthouse = _find_lighthouse()
+        self.timeout = timeout
+        self.pool = None
+        if pool_size > 0:
+            try:
+                self.pool = get_shared_pool(pool_size, max_audits)
+            except FileNotFoundError as e:
+                # Lighthouse may still find a browser of its own for each run
+                print(f"Chrome pool unavailable, starting Chrome per audit: {str(e)}")
 
     def collect_data(self, url):
         """Collect performance data using Lighthouse"""
@@ -23,23 +49,40 @@ class PerformanceCollector:
             # Create temporary directory for lighthouse report
             with tempfile.TemporaryDirectory() as tmp_dir:
                 output_path = Path(tmp_dir) / 'lighthouse-report.json'
-                
-                # Run lighthouse
-                subprocess.run([
-                    'lighthouse',
+                command = [
+                    self.lighthouse,
                     url,
                     '--output=json',
                     '--output-path=' + str(output_path),
-                    '--chrome-flags="--headless"',
                     '--only-categories=performance'
-                ], capture_output=True)
+                ]
+
+                # Run lighthouse, against a warm pooled browser when there is one
+                start = time.perf_counter()
+                with span('lighthouse', pooled=self.pool is not None):
+                    # A timeout inside pool.browser() also recycles the browser
+                    if self.pool is not None:
+                        with self.pool.browser() as port:
+                            subprocess.run(command + [f'--port={port}'], capture_output=True, timeout=self.timeout)
+                    else:
+                        subprocess.run(command + ['--chrome-flags="--headless"'], capture_output=True, timeout=self.timeout)
+                audit_seconds = time.perf_counter() - start
 
                 # Read the lighthouse report
                 with open(output_path) as f:
                     lighthouse_data = json.load(f)
 
-                return self._process_lighthouse_data(lighthouse_data)
+                performance_data = self._process_lighthouse_data(lighthouse_data)
+                performance_data['lighthouse_run'] = {
+                    'seconds': round(audit_seconds, 3),
+                    'pooled': self.pool is not None,
+                    'pool': self.pool.stats() if self.pool is not None else None
+                }
+                return performance_data
 
+        except subprocess.TimeoutExpired:
+            print(f"Lighthouse timed out after {self.timeout:g}s for {url}")
+            return None
         except Exception as e:
             print(f"Error collecting performance data: {str(e)}")
             return None
@@ -1,29 +1,76 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import re
-from llama_cpp import Llama
+import time
+from src.model_registry import get_model
+from src.completion_cache import CompletionCache
+from src.fingerprints import fingerprint
+from src.http_client import USER_AGENT
+from src.page_snapshot import PageSnapshot
+from src.seo_scoring import page_features, score_breakdown
+from src.tracing import record_usage, span
+
+MODEL_PATH = "models/llama-2-7b-chat.Q4_K_M.gguf"
+
+# Sampling parameters shared by every conclusion prompt
+COMPLETION_PARAMS = {
+    'temperature': 0.3,  # Reduced temperature for more focused responses
+    'top_p': 0.1,        # Reduced top_p for less creativity
+    'repeat_penalty': 1.2,
+    'stop': ["<end>"]
+}
 
 class SEOCollector:
     def __init__(self):
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': USER_AGENT
         }
-
-    def collect_data(self, url):
-        """Collect SEO-related data from the website"""
+        # When set to a CompletionBatch, conclusion prompts are queued on it
+        # instead of being evaluated immediately
+        self.llm_batch = None
+        # Overall score weights; None uses seo_scoring.DEFAULT_WEIGHTS
+        self.weights = None
+        self.completion_cache = CompletionCache()
+
+    def collect_data(self, url, snapshot=None, conclusion=True, previous=None, on_section=None):
+        """Collect SEO-related data from the website
+
+        With conclusion=False only the deterministic analyses and scores are
+        computed and no LLM prompt is run. previous is the SEO section of the
+        last report for the URL; if the extracted features and the scores
+        both match its fingerprints, its conclusion is reused instead of
+        prompting the model again.
+
+        on_section, if given, is called as on_section(name, value) as soon as
+        each section is ready: every analysis, 'score', each LLM answer as
+        'conclusion.<key>' and finally 'conclusion'.
+        """
+        emit = on_section or (lambda name, value: None)
         try:
-            response = requests.get(url, headers=self.headers)
+            if snapshot is None:
+                snapshot = PageSnapshot(url, self.headers)
+            response = snapshot.response
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            features = snapshot.features
             
             # Store data as instance variables
-            self._meta_data = self._analyze_meta_tags(soup)
-            self._headings = self._analyze_headings(soup)
-            self._links = self._analyze_links(soup, url)
-            self._images = self._analyze_images(soup)
+            self._meta_data = self._analyze_meta_tags(features)
+            emit('meta_tags', self._meta_data)
+            self._headings = self._analyze_headings(features)
+            emit('headings', self._headings)
+            self._links = self._analyze_links(features, url)
+            emit('links', self._links)
+            self._images = self._analyze_images(features)
+            emit('images', self._images)
             self._url_structure = self._analyze_url_structure(url)
-            self._mobile_friendly = self._check_mobile_friendly(soup)
+            emit('url_structure', self._url_structure)
+            self._mobile_friendly = self._check_mobile_friendly(features)
+            emit('mobile_friendly', self._mobile_friendly)
+            
+            # Scores are deterministic for a page, so compute them once and
+            # share them with the conclusion
+            with span('seo.scoring'):
+                self._scores = self._calculate_seo_score()
+            emit('score', self._scores)
             
             seo_data = {
                 'meta_tags': self._meta_data,
@@ -32,19 +79,42 @@ class SEOCollector:
                 'images': self._images,
                 'url_structure': self._url_structure,
                 'mobile_friendly': self._mobile_friendly,
-                'score': self._calculate_seo_score(),
-                'conclusion': self.generate_conclusion()
+                'score': self._scores
+            }
+            # The conclusion is built from exactly these analyses and scores
+            seo_data['fingerprints'] = {
+                'features': fingerprint({key: value for key, value in seo_data.items() if key != 'score'}),
+                'scores': fingerprint(self._scores)
             }
             
+            if conclusion and self._can_reuse_conclusion(seo_data, previous):
+                seo_data['conclusion'] = previous['conclusion']
+                seo_data['reused'] = ['conclusion']
+                emit('conclusion', seo_data['conclusion'])
+            elif conclusion and self.llm_batch is None:
+                seo_data['conclusion'] = self.generate_conclusion(
+                    self._scores, on_completion=lambda key, text: emit(f'conclusion.{key}', text)
+                )
+                seo_data['completion_cache'] = self._cache_usage
+                emit('conclusion', seo_data['conclusion'])
+            elif conclusion:
+                self._queue_conclusion(seo_data, self.llm_batch, emit)
+            
             return seo_data
         except Exception as e:
             print(f"Error collecting SEO data: {str(e)}")
             return None
 
-    def _analyze_meta_tags(self, soup):
+    def _can_reuse_conclusion(self, seo_data, previous):
+        """Whether the previous report's conclusion was built from the same features and scores"""
+        if not previous or not previous.get('conclusion'):
+            return False
+        return previous.get('fingerprints') == seo_data['fingerprints']
+
+    def _analyze_meta_tags(self, features):
         """Analyze meta tags including title and description"""
         meta_data = {
-            'title': soup.title.string if soup.title else None,
+            'title': features.title.string if features.title else None,
             'meta_description': None,
             'meta_keywords': None,
             'robots': None,
@@ -52,7 +122,7 @@ class SEOCollector:
             'charset': None
         }
 
-        for meta in soup.find_all('meta'):
+        for meta in features.all('meta'):
             name = meta.get('name', '').lower()
             content = meta.get('content', '')
             
@@ -70,24 +140,26 @@ class SEOCollector:
 
         return meta_data
 
-    def _analyze_headings(self, soup):
+    def _analyze_headings(self, features):
         """Analyze heading structure (h1-h6)"""
         headings = {}
         for i in range(1, 7):
-            h_tags = soup.find_all(f'h{i}')
+            h_tags = features.all(f'h{i}')
             headings[f'h{i}'] = {
                 'count': len(h_tags),
                 'content': [tag.get_text().strip() for tag in h_tags]
             }
         return headings
 
-    def _analyze_links(self, soup, base_url):
+    def _analyze_links(self, features, base_url):
         """Analyze internal and external links"""
         base_domain = urlparse(base_url).netloc
         internal_links = []
         external_links = []
 
-        for link in soup.find_all('a', href=True):
+        for link in features.all('a'):
+            if not link.has_attr('href'):
+                continue
             href = link['href']
             if href.startswith('/') or base_domain in href:
                 internal_links.append(href)
@@ -105,9 +177,9 @@ class SEOCollector:
             }
         }
 
-    def _analyze_images(self, soup):
+    def _analyze_images(self, features):
         """Analyze image tags and their attributes"""
-        images = soup.find_all('img')
+        images = features.all('img')
         return {
             'total_count': len(images),
             'with_alt': len([img for img in images if img.get('alt')]),
@@ -126,9 +198,9 @@ class SEOCollector:
             'is_clean': not bool(parsed_url.params or parsed_url.query)
         }
 
-    def _check_mobile_friendly(self, soup):
+    def _check_mobile_friendly(self, features):
         """Basic mobile-friendly check based on viewport meta tag"""
-        viewport = soup.find('meta', attrs={'name': 'viewport'})
+        viewport = features.first('meta', name='viewport')
         return {
             'has_viewport': bool(viewport),
             'viewport_content': viewport.get('content') if viewport else None
@@ -136,177 +208,84 @@ class SEOCollector:
 
     def _calculate_seo_score(self):
         """Calculate overall SEO score based on collected metrics with formula explanations"""
-        llm = Llama(
-            model_path="models/llama-2-7b-chat.Q4_K_M.gguf",
-            n_ctx=2048,
-            n_threads=4,
-            verbose=False
-        )
-
-        # Initialize scores dictionary
-        scores = {}
-
-        # Meta Tags Score
-        meta_score = 0
-        if hasattr(self, '_meta_data'):
-            meta = self._meta_data
-            title_points = 20 if meta.get('title') else 0
-            desc_points = 20 if meta.get('meta_description') else 0
-            keywords_points = 15 if meta.get('meta_keywords') else 0
-            robots_points = 15 if meta.get('robots') else 0
-            viewport_points = 15 if meta.get('viewport') else 0
-            charset_points = 15 if meta.get('charset') else 0
-            meta_score = title_points + desc_points + keywords_points + robots_points + viewport_points + charset_points
-
-        meta_prompt = f"""Score breakdown (max 100):
-- Title: {20 if meta.get('title') else 0}/20 points
-- Meta description: {20 if meta.get('meta_description') else 0}/20 points
-- Meta keywords: {15 if meta.get('meta_keywords') else 0}/15 points
-- Robots tag: {15 if meta.get('robots') else 0}/15 points
-- Viewport tag: {15 if meta.get('viewport') else 0}/15 points
-- Charset: {15 if meta.get('charset') else 0}/15 points"""
-
-        scores['meta_tags'] = {
-            'value': meta_score,
-            'description': meta_prompt
-        }
-
-        # Similar updates for other scores...
-        heading_score = 0
-        if hasattr(self, '_headings'):
-            h_tags = self._headings
-            h1_count_points = 40 if h_tags.get('h1', {}).get('count') == 1 else 0
-            h2_points = 20 if h_tags.get('h2', {}).get('count') > 0 else 0
-            h1_length_points = 20 if all(len(content) < 70 for content in h_tags.get('h1', {}).get('content', [])) else 0
-            total_headings_points = 20 if sum(h.get('count', 0) for h in h_tags.values()) < 15 else 0
-            heading_score = h1_count_points + h2_points + h1_length_points + total_headings_points
-
-        headings_prompt = f"""Score breakdown (max 100):
-- Single H1 tag: {40 if h_tags.get('h1', {}).get('count') == 1 else 0}/40 points
-- H2 tags present: {20 if h_tags.get('h2', {}).get('count') > 0 else 0}/20 points
-- H1 length < 70 chars: {20 if all(len(content) < 70 for content in h_tags.get('h1', {}).get('content', [])) else 0}/20 points
-- Total headings < 15: {20 if sum(h.get('count', 0) for h in h_tags.values()) < 15 else 0}/20 points"""
-
-        scores['headings'] = {
-            'value': heading_score,
-            'description': headings_prompt
-        }
-
-        # Links Score
-        links_score = 0
-        if hasattr(self, '_links'):
-            links = self._links
-            internal_count = links.get('internal', {}).get('count', 0)
-            external_count = links.get('external', {}).get('count', 0)
-            internal_points = 40 if internal_count > 0 else 0
-            external_points = 30 if external_count > 0 else 0
-            ratio_points = 30 if internal_count > external_count else 0
-            links_score = internal_points + external_points + ratio_points
-
-        links_prompt = f"""Score breakdown (max 100):
-- Has internal links: {40 if internal_count > 0 else 0}/40 points
-- Has external links: {30 if external_count > 0 else 0}/30 points
-- More internal than external: {30 if internal_count > external_count else 0}/30 points"""
-
-        scores['links'] = {
-            'value': links_score,
-            'description': links_prompt
+        features = page_features({
+            'meta_tags': self._meta_data,
+            'headings': self._headings,
+            'links': self._links,
+            'images': self._images,
+            'mobile_friendly': self._mobile_friendly
+        })
+        return score_breakdown(features, self.weights)
+
+    def generate_conclusion(self, scores=None, on_completion=None):
+        """Generate a structured SEO analysis report with minimal hallucination
+
+        on_completion, if given, is called with (section key, text) after each
+        prompt is answered.
+        """
+        if scores is None:
+            scores = self._calculate_seo_score()
+
+        page = {
+            'meta_tags': self._meta_data,
+            'headings': self._headings,
+            'links': self._links,
+            'images': self._images,
+            'mobile_friendly': self._mobile_friendly
         }
+        critical_issues, prompts = self._build_conclusion_prompts(page, scores)
 
-        # Images Score
-        images_score = 0
-        if hasattr(self, '_images'):
-            imgs = self._images
-            total_images = imgs.get('total_count', 0)
-            if total_images > 0:
-                alt_ratio = imgs.get('with_alt', 0) / total_images
-                images_score = int(alt_ratio * 100)
-
-        images_prompt = f"""Score breakdown (max 100):
-- Alt text coverage: {images_score}/100 points
-  ({imgs.get('with_alt', 0)} of {total_images} images have alt text)"""
-
-        scores['images'] = {
-            'value': images_score,
-            'description': images_prompt
-        }
+        self._cache_usage = {'hits': 0, 'misses': 0}
 
-        # Mobile Score
-        mobile_score = 0
-        if hasattr(self, '_mobile_friendly'):
-            mobile = self._mobile_friendly
-            viewport_present = 50 if mobile.get('has_viewport') else 0
-            viewport_content = mobile.get('viewport_content', '')
-            device_width = 25 if 'width=device-width' in viewport_content else 0
-            initial_scale = 25 if 'initial-scale=1' in viewport_content else 0
-            mobile_score = viewport_present + device_width + initial_scale
-
-        mobile_prompt = f"""Score breakdown (max 100):
-- Viewport meta tag: {50 if mobile.get('has_viewport') else 0}/50 points
-- width=device-width: {25 if 'width=device-width' in viewport_content else 0}/25 points
-- initial-scale=1: {25 if 'initial-scale=1' in viewport_content else 0}/25 points"""
-
-        scores['mobile'] = {
-            'value': mobile_score,
-            'description': mobile_prompt
-        }
+        # Loaded on the first cache miss only
+        def load_model():
+            return get_model(MODEL_PATH, n_ctx=4096, n_threads=4)
 
-        # Overall Score
-        weights = {
-            'meta_tags': 0.25,
-            'headings': 0.20,
-            'links': 0.20,
-            'images': 0.15,
-            'mobile': 0.20
-        }
-        
-        overall_score = sum(scores[key]['value'] * weights[key] for key in weights)
-
-        overall_prompt = f"""Score breakdown (weighted average):
-- Meta tags: {scores['meta_tags']['value']} × 25% = {scores['meta_tags']['value'] * 0.25:.1f}
-- Headings: {scores['headings']['value']} × 20% = {scores['headings']['value'] * 0.20:.1f}
-- Links: {scores['links']['value']} × 20% = {scores['links']['value'] * 0.20:.1f}
-- Images: {scores['images']['value']} × 15% = {scores['images']['value'] * 0.15:.1f}
-- Mobile: {scores['mobile']['value']} × 20% = {scores['mobile']['value'] * 0.20:.1f}"""
-
-        scores['overall'] = {
-            'value': round(overall_score),
-            'description': overall_prompt
-        }
-
-        return scores
-
-    def generate_conclusion(self):
-        """Generate a structured SEO analysis report with minimal hallucination"""
-        llm = Llama(
-            model_path="models/llama-2-7b-chat.Q4_K_M.gguf",
-            n_ctx=4096,
-            n_threads=4,
-            verbose=False
-        )
-
-        scores = self._calculate_seo_score()
-        
-        def get_completion(prompt, max_tokens=200):
+        def get_completion(key, prompt, max_tokens=200):
             """Helper function to get completion with consistent parameters"""
-            response = llm.create_completion(
-                prompt,
-                max_tokens=max_tokens,
-                temperature=0.3,  # Reduced temperature for more focused responses
-                top_p=0.1,       # Reduced top_p for less creativity
-                repeat_penalty=1.2,
-                stop=["<end>"]
+            params = dict(COMPLETION_PARAMS, max_tokens=max_tokens)
+            with span('llm.completion', section=key, max_tokens=max_tokens) as attributes:
+                start = time.perf_counter()
+                response, hit = self.completion_cache.complete(load_model, MODEL_PATH, prompt, params)
+                record_usage(attributes, response, hit, time.perf_counter() - start)
+            self._cache_usage['hits' if hit else 'misses'] += 1
+            text = response['choices'][0]['text'].strip()
+            if on_completion is not None:
+                on_completion(key, text)
+            return text
+
+        completions = {
+            key: get_completion(key, prompt, max_tokens)
+            for key, (prompt, max_tokens) in prompts.items()
+        }
+        return self._assemble_conclusion(page, scores, critical_issues, completions)
+
+    def _queue_conclusion(self, seo_data, llm_batch, emit):
+        """Submit the conclusion prompts to a shared batch and fill in the
+        conclusion once the batch has run"""
+        critical_issues, prompts = self._build_conclusion_prompts(seo_data, seo_data['score'])
+
+        def on_complete(completions):
+            for key, text in completions.items():
+                emit(f'conclusion.{key}', text)
+            seo_data['conclusion'] = self._assemble_conclusion(
+                seo_data, seo_data['score'], critical_issues, completions
             )
-            return response['choices'][0]['text'].strip()
+            emit('conclusion', seo_data['conclusion'])
+
+        seo_data['conclusion'] = None
+        llm_batch.submit(prompts, on_complete)
 
+    def _build_conclusion_prompts(self, page, scores):
+        """Build every prompt needed for the conclusion, keyed by report section"""
         # Executive Summary - restore previous version with clear data points
         executive_prompt = f"""Based on an overall SEO score of {scores['overall']['value']}/100, provide a concise overview of the website's SEO health. Include:
 
 Current Metrics:
 - Meta tags: {scores['meta_tags']['value']}/100
 - Headings: {scores['headings']['value']}/100
-- Links: {scores['links']['value']}/100 ({self._links['internal']['count']} internal, {self._links['external']['count']} external)
-- Images: {scores['images']['value']}/100 ({self._images['with_alt']}/{self._images['total_count']} with alt text)
+- Links: {scores['links']['value']}/100 ({page['links']['internal']['count']} internal, {page['links']['external']['count']} external)
+- Images: {scores['images']['value']}/100 ({page['images']['with_alt']}/{page['images']['total_count']} with alt text)
 - Mobile: {scores['mobile']['value']}/100
 
 Write 2-3 sentences describing the overall SEO health, mentioning both strengths and areas needing improvement. Focus on the actual scores and metrics provided."""
@@ -314,15 +293,15 @@ Write 2-3 sentences describing the overall SEO health, mentioning both strengths
         # Critical Issues - only based on actual low scores and missing elements
         critical_issues = []
         if scores['meta_tags']['value'] < 100:
-            if not self._meta_data.get('meta_description'):
+            if not page['meta_tags'].get('meta_description'):
                 critical_issues.append("Missing meta description")
-            if not self._meta_data.get('meta_keywords'):
+            if not page['meta_tags'].get('meta_keywords'):
                 critical_issues.append("Missing meta keywords")
         
-        if self._images['without_alt'] > 0:
-            critical_issues.append(f"Missing alt text on {self._images['without_alt']} images")
+        if page['images']['without_alt'] > 0:
+            critical_issues.append(f"Missing alt text on {page['images']['without_alt']} images")
         
-        if self._links['internal']['count'] < self._links['external']['count']:
+        if page['links']['internal']['count'] < page['links']['external']['count']:
             critical_issues.append("More external links than internal links")
 
         issues_prompt = f"""For these specific issues, explain their SEO impact:
@@ -331,8 +310,8 @@ Write 2-3 sentences describing the overall SEO health, mentioning both strengths
         # More creative recommendations and advantages sections
         recommendations_prompt = f"""Based on these specific SEO metrics:
 - Meta score: {scores['meta_tags']['value']}/100 ({', '.join(critical_issues) if critical_issues else 'no issues'})
-- Links: {self._links['internal']['count']} internal vs {self._links['external']['count']} external
-- Images: {self._images['with_alt']}/{self._images['total_count']} optimized
+- Links: {page['links']['internal']['count']} internal vs {page['links']['external']['count']} external
+- Images: {page['images']['with_alt']}/{page['images']['total_count']} optimized
 - Overall score: {scores['overall']['value']}/100
 
 Provide strategic recommendations in these timeframes:
@@ -373,7 +352,7 @@ Keep suggestions realistic and cost-effective for a local garage."""
         innovation_prompt = f"""For an automotive website with strong technical foundations:
 - Mobile score: {scores['mobile']['value']}/100
 - Overall SEO: {scores['overall']['value']}/100
-- Digital presence: {self._links['internal']['count']} internal pages
+- Digital presence: {page['links']['internal']['count']} internal pages
 
 Imagine future-focused innovations that could revolutionize the digital presence of automotive businesses. Consider:
 1. Emerging technologies
@@ -384,104 +363,92 @@ Imagine future-focused innovations that could revolutionize the digital presence
 
 Think big and visionary, but keep the automotive industry context."""
 
+        # Keys identify the report section each completion belongs to
+        prompts = {'overview': (executive_prompt, 200)}
+        for i, issue in enumerate(critical_issues):
+            prompts[f'impact_{i}'] = (f"What is the SEO impact of: {issue}? Answer in one sentence.", 200)
+        prompts['immediate_actions'] = (recommendations_prompt + "\nList 3-4 innovative immediate actions:", 300)
+        prompts['medium_term_improvements'] = (recommendations_prompt + "\nList 3-4 strategic medium-term improvements:", 300)
+        prompts['long_term_strategy'] = (recommendations_prompt + "\nList 3-4 visionary long-term strategies:", 300)
+        prompts['current_strengths'] = (advantages_prompt + "\nList 3-4 unique competitive advantages:", 300)
+        prompts['growth_opportunities'] = (practical_growth_prompt + "\nList 3-4 practical growth opportunities:", 300)
+        prompts['innovation_ideas'] = (innovation_prompt + "\nList 2-3 innovative future possibilities:", 300)
+
+        return critical_issues, prompts
+
+    def _assemble_conclusion(self, page, scores, critical_issues, completions):
+        """Build the structured conclusion from the completed prompts"""
+        def as_lines(key):
+            return [x.strip() for x in completions[key].split('\n') if x.strip()]
+
         # Build the structured report
         report = {
             "seo_audit_report": {
                 "executive_summary": {
-                    "overview": get_completion(executive_prompt),
+                    "overview": completions['overview'],
                     "key_findings": critical_issues[:3]  # Only use actual found issues
                 },
                 "critical_issues": [
                     {
                         "issue": issue,
-                        "impact": get_completion(f"What is the SEO impact of: {issue}? Answer in one sentence.")
+                        "impact": completions[f'impact_{i}']
                     }
-                    for issue in critical_issues
+                    for i, issue in enumerate(critical_issues)
                 ],
                 "detailed_analysis": {
                     "meta_tags_and_content": {
-                        "title": self._meta_data.get('title'),
-                        "meta_description": self._meta_data.get('meta_description'),
+                        "title": page['meta_tags'].get('title'),
+                        "meta_description": page['meta_tags'].get('meta_description'),
                         "issues": [
                             f"Missing {tag}" for tag in ['meta_description', 'meta_keywords'] 
-                            if not self._meta_data.get(tag)
+                            if not page['meta_tags'].get(tag)
                         ],
                         "score": scores['meta_tags']['value']
                     },
                     "heading_structure": {
-                        "h1": self._headings['h1']['content'][0] if self._headings['h1']['content'] else None,
-                        "h2_count": self._headings['h2']['count'],
+                        "h1": page['headings']['h1']['content'][0] if page['headings']['h1']['content'] else None,
+                        "h2_count": page['headings']['h2']['count'],
                         "issues": [
-                            "Multiple H1 tags" if self._headings['h1']['count'] > 1 else None,
-                            "No H2 tags" if self._headings['h2']['count'] == 0 else None
+                            "Multiple H1 tags" if page['headings']['h1']['count'] > 1 else None,
+                            "No H2 tags" if page['headings']['h2']['count'] == 0 else None
                         ],
                         "score": scores['headings']['value']
                     },
                     "link_strategy": {
-                        "internal_links": self._links['internal']['count'],
-                        "external_links": self._links['external']['count'],
-                        "distribution": f"{self._links['internal']['count']} internal vs {self._links['external']['count']} external",
+                        "internal_links": page['links']['internal']['count'],
+                        "external_links": page['links']['external']['count'],
+                        "distribution": f"{page['links']['internal']['count']} internal vs {page['links']['external']['count']} external",
                         "issues": [
-                            "More external than internal links" if self._links['external']['count'] > self._links['internal']['count'] else None,
-                            "Low internal link count" if self._links['internal']['count'] < 5 else None
+                            "More external than internal links" if page['links']['external']['count'] > page['links']['internal']['count'] else None,
+                            "Low internal link count" if page['links']['internal']['count'] < 5 else None
                         ],
                         "score": scores['links']['value']
                     },
                     "image_optimization": {
-                        "optimized_images": self._images['with_alt'],
-                        "total_images": self._images['total_count'],
+                        "optimized_images": page['images']['with_alt'],
+                        "total_images": page['images']['total_count'],
                         "issues": [
-                            f"{self._images['without_alt']} images missing alt text" if self._images['without_alt'] > 0 else None
+                            f"{page['images']['without_alt']} images missing alt text" if page['images']['without_alt'] > 0 else None
                         ],
                         "score": scores['images']['value']
                     },
                     "mobile_optimization": {
-                        "viewport": self._mobile_friendly['viewport_content'],
+                        "viewport": page['mobile_friendly']['viewport_content'],
                         "issues": [
-                            "Missing viewport meta tag" if not self._mobile_friendly['has_viewport'] else None
+                            "Missing viewport meta tag" if not page['mobile_friendly']['has_viewport'] else None
                         ],
                         "score": scores['mobile']['value']
                     }
                 },
                 "actionable_recommendations": {
-                    "immediate_actions": [
-                        x.strip() for x in get_completion(
-                            recommendations_prompt + "\nList 3-4 innovative immediate actions:",
-                            max_tokens=300
-                        ).split('\n') if x.strip()
-                    ],
-                    "medium_term_improvements": [
-                        x.strip() for x in get_completion(
-                            recommendations_prompt + "\nList 3-4 strategic medium-term improvements:",
-                            max_tokens=300
-                        ).split('\n') if x.strip()
-                    ],
-                    "long_term_strategy": [
-                        x.strip() for x in get_completion(
-                            recommendations_prompt + "\nList 3-4 visionary long-term strategies:",
-                            max_tokens=300
-                        ).split('\n') if x.strip()
-                    ]
+                    "immediate_actions": as_lines('immediate_actions'),
+                    "medium_term_improvements": as_lines('medium_term_improvements'),
+                    "long_term_strategy": as_lines('long_term_strategy')
                 },
                 "competitive_advantages": {
-                    "current_strengths": [
-                        x.strip() for x in get_completion(
-                            advantages_prompt + "\nList 3-4 unique competitive advantages:",
-                            max_tokens=300
-                        ).split('\n') if x.strip()
-                    ],
-                    "growth_opportunities": [
-                        x.strip() for x in get_completion(
-                            practical_growth_prompt + "\nList 3-4 practical growth opportunities:",
-                            max_tokens=300
-                        ).split('\n') if x.strip()
-                    ],
-                    "innovation_ideas": [
-                        x.strip() for x in get_completion(
-                            innovation_prompt + "\nList 2-3 innovative future possibilities:",
-                            max_tokens=300
-                        ).split('\n') if x.strip()
-                    ]
+                    "current_strengths": as_lines('current_strengths'),
+                    "growth_opportunities": as_lines('growth_opportunities'),
+                    "innovation_ideas": as_lines('innovation_ideas')
                 }
             }
         }
@@ -1,47 +1,118 @@
-import requests
 import ssl
 import socket
 from urllib.parse import urlparse
-import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
 import urllib3
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from src.page_snapshot import PageSnapshot
+from src.http_cache import http_cache
+from src.http_client import http_client, USER_AGENT
+from src.host_cache import host_cache
+from src.sitemap_parser import SitemapParser
+from src.tracing import bind, span
+
+# Report key -> (method, argument). Every check is independent of the others,
+# so they run concurrently; 'snapshot' checks share one download of the page.
+CHECKS = {
+    'ssl_info': ('_check_ssl', 'url'),
+    'security_headers': ('_check_security_headers', 'snapshot'),
+    'robots_txt': ('_analyze_robots_txt', 'url'),
+    'sitemap': ('_analyze_sitemap', 'url'),
+    'schema_markup': ('_check_schema_markup', 'snapshot'),
+    'mobile_responsive': ('_check_mobile_responsive', 'snapshot'),
+    'accessibility': ('_check_accessibility', 'snapshot'),
+    'w3c_validity': ('_check_w3c_validity', 'url'),
+    'pagespeed': ('_get_pagespeed_data', 'url'),
+    'mozilla_observatory': ('_check_mozilla_observatory', 'url')
+}
+
+# Checks whose result depends only on the host; they are run against the
+# site root and their results shared through host_cache
+HOST_CHECKS = {'ssl_info', 'robots_txt', 'sitemap', 'mozilla_observatory'}
 
 class TechnicalCollector:
-    def __init__(self):
+    def __init__(self, max_workers=4):
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': USER_AGENT
         }
+        # Checks running at once for one URL
+        self.max_workers = max_workers
         # Disable SSL warnings for internal checks
         urllib3.disable_warnings()
 
-    def collect_data(self, url):
+    def collect_data(self, url, snapshot=None):
         """Collect technical data about the website"""
         try:
-            technical_data = {
-                'ssl_info': self._check_ssl(url),
-                'security_headers': self._check_security_headers(url),
-                'robots_txt': self._analyze_robots_txt(url),
-                'sitemap': self._analyze_sitemap(url),
-                'schema_markup': self._check_schema_markup(url),
-                'mobile_responsive': self._check_mobile_responsive(url),
-                'accessibility': self._check_accessibility(url),
-                'w3c_validity': self._check_w3c_validity(url),
-                'pagespeed': self._get_pagespeed_data(url),
-                'mozilla_observatory': self._check_mozilla_observatory(url)
+            if snapshot is None:
+                snapshot = PageSnapshot(url, self.headers)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    key: pool.submit(bind(self._run_check), key, method, snapshot if argument == 'snapshot' else url)
+                    for key, (method, argument) in CHECKS.items()
+                }
+                results = {key: future.result() for key, future in futures.items()}
+            wall_seconds = time.perf_counter() - start
+
+            technical_data = {key: result for key, (result, _, _) in results.items()}
+            durations = {key: round(seconds, 3) for key, (_, seconds, _) in results.items()}
+            technical_data['check_timings'] = {
+                'checks': durations,
+                'max_workers': self.max_workers,
+                'wall_seconds': round(wall_seconds, 3),
+                # The slowest single check bounds the wall time from below
+                'critical_path_seconds': max(durations.values()),
+                'critical_path_check': max(durations, key=durations.get),
+                'sequential_seconds': round(sum(seconds for _, seconds, _ in results.values()), 3)
+            }
+            technical_data['host_cache'] = {
+                key: origin for key, (_, _, origin) in results.items() if origin is not None
             }
             return technical_data
         except Exception as e:
             print(f"Error collecting technical data: {str(e)}")
             return None
 
+    def _run_check(self, key, method, argument):
+        """Run one check and return (result, seconds, cache origin or None)
+
+        Host-level checks run against the site root and go through host_cache.
+        """
+        start = time.perf_counter()
+        check = getattr(self, method)
+        with span(f'technical.{key}') as attributes:
+            result, origin = self._cached_check(key, check, argument)
+            if origin is not None:
+                attributes['cache'] = origin['source']
+        return result, time.perf_counter() - start, origin
+
+    def _cached_check(self, key, check, argument):
+        """Run a check, through host_cache for host-level checks; returns (result, origin)
+
+        Only definitive results are cached: not those with an 'error' (timeouts,
+        server errors) nor an Observatory scan still queued without a score, so
+        either is retried on the next report.
+        """
+        if key in HOST_CHECKS:
+            parsed_url = urlparse(argument)
+            site_root = f"{parsed_url.scheme}://{parsed_url.netloc}"
+            host = site_root if key in ('robots_txt', 'sitemap') else parsed_url.netloc
+            result, origin = host_cache.get_or_compute(
+                key, host, lambda: check(site_root),
+                cacheable=lambda value: _is_definitive(key, value)
+            )
+            return result, origin
+        return check(argument), None
+
     def _check_ssl(self, url):
         """Check SSL certificate status"""
         parsed_url = urlparse(url)
         try:
             context = ssl.create_default_context()
-            with socket.create_connection((parsed_url.netloc, 443)) as sock:
+            with socket.create_connection((parsed_url.netloc, 443), timeout=http_client.timeout[0]) as sock:
                 with context.wrap_socket(sock, server_hostname=parsed_url.netloc) as ssock:
                     cert = ssock.getpeercert()
                     return {
@@ -56,10 +127,10 @@ class TechnicalCollector:
                 'error': str(e)
             }
 
-    def _check_security_headers(self, url):
+    def _check_security_headers(self, snapshot):
         """Check security headers"""
         try:
-            response = requests.get(url, headers=self.headers)
+            response = snapshot.response
             headers = response.headers
             
             return {
@@ -78,7 +149,7 @@ class TechnicalCollector:
         """Analyze robots.txt file"""
         try:
             robots_url = f"{url.rstrip('/')}/robots.txt"
-            response = requests.get(robots_url, headers=self.headers)
+            response = http_cache.get(robots_url, headers=self.headers)
             if response.status_code == 200:
                 content = response.text
                 return {
@@ -87,36 +158,28 @@ class TechnicalCollector:
                     'user_agents': self._parse_robots_txt(content),
                     'has_sitemap': 'sitemap:' in content.lower()
                 }
-            return {'exists': False}
-        except Exception:
-            return {'exists': False}
+            if response.status_code == 404:
+                return {'exists': False}
+            return {'exists': False, 'error': f"HTTP {response.status_code}"}
+        except Exception as e:
+            return {'exists': False, 'error': str(e)}
 
     def _analyze_sitemap(self, url):
         """Analyze sitemap.xml"""
         try:
             sitemap_url = f"{url.rstrip('/')}/sitemap.xml"
-            response = requests.get(sitemap_url, headers=self.headers)
-            if response.status_code == 200:
-                root = ET.fromstring(response.content)
-                urls = root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}url')
-                return {
-                    'exists': True,
-                    'url_count': len(urls),
-                    'last_modified': self._get_latest_sitemap_date(urls)
-                }
-            return {'exists': False}
-        except Exception:
-            return {'exists': False}
+            return SitemapParser(headers=self.headers).summarize(sitemap_url)
+        except Exception as e:
+            return {'exists': False, 'error': str(e)}
 
-    def _check_schema_markup(self, url):
+    def _check_schema_markup(self, snapshot):
         """Check for schema.org markup"""
         try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            features = snapshot.features
             schemas = []
             
             # Check JSON-LD
-            json_ld = soup.find_all('script', type='application/ld+json')
+            json_ld = [script for script in features.all('script') if script.get('type') == 'application/ld+json']
             for script in json_ld:
                 try:
                     schemas.append(json.loads(script.string))
@@ -124,7 +187,7 @@ class TechnicalCollector:
                     continue
 
             # Check microdata
-            microdata = soup.find_all(attrs={"itemtype": True})
+            microdata = features.with_itemtype
             schemas.extend([item['itemtype'] for item in microdata])
 
             return {
@@ -134,36 +197,35 @@ class TechnicalCollector:
         except Exception:
             return {'has_schema': False}
 
-    def _check_mobile_responsive(self, url):
+    def _check_mobile_responsive(self, snapshot):
         """Check mobile responsiveness"""
         try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            features = snapshot.features
             
-            viewport = soup.find('meta', attrs={'name': 'viewport'})
-            media_queries = len(soup.find_all('link', attrs={'media': True}))
+            viewport = features.first('meta', name='viewport')
+            media_queries = len([link for link in features.all('link') if link.has_attr('media')])
             
             return {
                 'has_viewport': viewport is not None,
                 'viewport_content': viewport['content'] if viewport else None,
                 'media_queries': media_queries,
-                'responsive_images': self._check_responsive_images(soup)
+                'responsive_images': self._check_responsive_images(features)
             }
         except Exception:
             return None
 
-    def _check_accessibility(self, url):
+    def _check_accessibility(self, snapshot):
         """Check basic accessibility features"""
         try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            features = snapshot.features
+            images = features.all('img')
             
             return {
-                'images_with_alt': len(soup.find_all('img', alt=True)),
-                'images_without_alt': len(soup.find_all('img', alt=False)),
-                'aria_landmarks': len(soup.find_all(attrs={"role": True})),
-                'form_labels': len(soup.find_all('label')),
-                'skip_links': len(soup.find_all('a', attrs={'href': '#main'}))
+                'images_with_alt': len([img for img in images if img.has_attr('alt')]),
+                'images_without_alt': len([img for img in images if not img.has_attr('alt')]),
+                'aria_landmarks': len(features.with_role),
+                'form_labels': features.count('label'),
+                'skip_links': len([a for a in features.all('a') if a.get('href') == '#main'])
             }
         except Exception:
             return None
@@ -172,7 +234,7 @@ class TechnicalCollector:
         """Check W3C validity with detailed messages"""
         try:
             validator_url = f"https://validator.w3.org/nu/?doc={url}&out=json"
-            response = requests.get(validator_url, headers={
+            response = http_client.get(validator_url, headers={
                 'User-Agent': 'Mozilla/5.0',
                 'Accept': 'application/json'
             })
@@ -202,7 +264,8 @@ class TechnicalCollector:
         """Get PageSpeed Insights data"""
         try:
             api_url = f"https://www.googleapis.com/pagespeedonline/v5/runPagespeed?url={url}&strategy=mobile"
-            response = requests.get(api_url)
+            # PageSpeed runs a full Lighthouse audit before answering
+            response = http_client.get(api_url, timeout=(http_client.timeout[0], 120))
             if response.status_code == 200:
                 data = response.json()
                 return {
@@ -219,10 +282,11 @@ class TechnicalCollector:
         """Check Mozilla Observatory security score"""
         try:
             api_url = f"https://http-observatory.security.mozilla.org/api/v1/analyze?host={urlparse(url).netloc}"
-            response = requests.post(api_url)
+            response = http_client.post(api_url)
             if response.status_code == 200:
                 data = response.json()
                 return {
+                    'state': data.get('state'),
                     'score': data.get('score'),
                     'grade': data.get('grade'),
                     'tests_passed': data.get('tests_passed'),
@@ -248,20 +312,21 @@ class TechnicalCollector:
                     
         return user_agents
 
-    def _get_latest_sitemap_date(self, urls):
-        """Get the latest modification date from sitemap"""
-        latest_date = None
-        for url in urls:
-            lastmod = url.find('{http://www.sitemaps.org/schemas/sitemap/0.9}lastmod')
-            if lastmod is not None and (latest_date is None or lastmod.text > latest_date):
-                latest_date = lastmod.text
-        return latest_date
-
-    def _check_responsive_images(self, soup):
+    def _check_responsive_images(self, features):
         """Check for responsive image features"""
-        images = soup.find_all('img')
+        images = features.all('img')
         return {
             'total': len(images),
             'srcset': len([img for img in images if img.get('srcset')]),
             'sizes': len([img for img in images if img.get('sizes')])
-        } 
\ No newline at end of file
+        } 
+
+
+def _is_definitive(key, value):
+    """Whether a host-level check result is final and may be cached"""
+    if value is None or 'error' in value:
+        return False
+    if key == 'mozilla_observatory':
+        # A pending or queued scan has no score or grade yet
+        return value.get('state') == 'FINISHED' or value.get('score') is not None or value.get('grade') is not None
+    return True
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path("cache/completions.sqlite")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Sampling parameters that change the completion and therefore the cache key
+KEY_PARAMS = ('temperature', 'top_p', 'repeat_penalty', 'max_tokens', 'stop')
+
+
+class CompletionCache:
+    """Persistent, size-bounded LRU cache of LLM completions
+
+    Entries are keyed by a hash of the prompt, the model file and the sampling
+    parameters, so a changed model or temperature never serves stale text.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._model_hashes = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("""CREATE TABLE IF NOT EXISTS completions (
+            key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL
+        )""")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS model_hashes (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            digest TEXT NOT NULL
+        )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used)")
+        self._db.commit()
+
+    def complete(self, load_model, model_path, prompt, params):
+        """Return (response, hit) for a prompt, calling the model only on a miss
+
+        load_model is called for the model on a miss only, so a run served
+        entirely from the cache never loads the weights.
+        """
+        key = self._key(model_path, prompt, params)
+        with self._lock:
+            row = self._db.execute("SELECT response FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE completions SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+                self.hits += 1
+                return json.loads(row[0]), True
+            self.misses += 1
+
+        response = load_model().create_completion(prompt, **params)
+        self._store(key, response)
+        return response, False
+
+    def stats(self):
+        """Hit/miss counters and current size of the cache"""
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': size,
+            'max_bytes': self.max_bytes
+        }
+
+    def _store(self, key, response):
+        """Insert a response and evict least recently used entries over the size bound"""
+        payload = json.dumps(response, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions (key, response, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, payload, size, time.time())
+            )
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, old_size in self._db.execute(
+                    "SELECT key, size FROM completions ORDER BY last_used"
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM completions WHERE key = ?", (old_key,))
+                    total -= old_size
+                    self.evictions += 1
+            self._db.commit()
+
+    def _key(self, model_path, prompt, params):
+        """Hash the prompt, model file and sampling parameters into a cache key"""
+        material = {
+            'prompt': prompt,
+            'model': self._model_hash(model_path),
+            'params': {name: params.get(name) for name in KEY_PARAMS}
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _model_hash(self, model_path):
+        """Hash the model file, remembering the digest while its size and mtime are unchanged"""
+        path = str(Path(model_path).resolve())
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # A missing file can't produce completions; key by path alone
+            return path
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            cached = self._model_hashes.get(path)
+            if cached and cached[0] == signature:
+                return cached[1]
+            row = self._db.execute(
+                "SELECT size, mtime_ns, digest FROM model_hashes WHERE path = ?", (path,)
+            ).fetchone()
+            if row and (row[0], row[1]) == signature:
+                self._model_hashes[path] = (signature, row[2])
+                return row[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO model_hashes (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, digest)
+            )
+            self._db.commit()
+            self._model_hashes[path] = (signature, digest)
+        return digest
@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from urllib.parse import urljoin, urldefrag, urlparse, urlunparse
+from src.collectors.seo_collector import SEOCollector
+from src.http_cache import http_cache
+from src.http_client import http_client
+from src.page_snapshot import PageSnapshot
+
+# Links to these resources are never HTML pages, so they are not fetched
+SKIPPED_EXTENSIONS = (
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.pdf', '.zip',
+    '.css', '.js', '.xml', '.mp4', '.mp3', '.doc', '.docx', '.xls', '.xlsx'
+)
+
+SCORE_KEYS = ['meta_tags', 'headings', 'links', 'images', 'mobile', 'overall']
+
+
+class SiteCrawler:
+    """Crawl of a site's internal links, analyzing every page for SEO
+
+    Pages are fetched concurrently from a rolling frontier: each link is
+    submitted as soon as the page linking to it is analyzed, so no page waits
+    for the slowest page of its depth level. A page's depth is that of the
+    first page found linking to it plus one. URLs are normalized (resolved,
+    fragment stripped) and de-duplicated, and the crawl stops at max_depth
+    links from the start page or after max_pages pages.
+
+    Every <a href> of a page is followed, resolved against the page's URL
+    after redirects. URLs are normalized (fragment stripped, scheme and host
+    lower-cased, default port dropped) and a trailing slash does not make a
+    page new. Pages are analyzed
+    with SEOCollector, scored with score_weights, and only get the LLM
+    conclusion when llm is set.
+    """
+
+    def __init__(self, max_depth=3, max_pages=500, max_workers=8, llm=False, score_weights=None):
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_workers = max_workers
+        self.llm = llm
+        self.score_weights = score_weights
+        # SEOCollector keeps per-page state, so each worker thread gets its own
+        self._local = threading.local()
+
+    def crawl(self, start_url):
+        """Crawl the site and return a site-level report"""
+        start_url = self._normalize(start_url)
+        # Replaced by the host the start page redirects to, if any
+        host = urlparse(start_url).netloc
+        started = datetime.now()
+        start = time.perf_counter()
+
+        # Visit keys of every URL discovered so far
+        seen = {self._visit_key(start_url)}
+        pages = {}
+        submitted = 1
+
+        print(f"Crawling {start_url} (up to {self.max_pages} pages, depth {self.max_depth})...")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # Future -> (url, depth) of every page being analyzed
+            in_flight = {pool.submit(self._analyze, start_url): (start_url, 0)}
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth = in_flight.pop(future)
+                    seo_data, final_url, links = future.result()
+                    pages[url] = {'depth': depth, 'seo': seo_data}
+                    final_url = self._normalize(final_url)
+                    seen.add(self._visit_key(final_url))
+                    if depth == 0:
+                        host = urlparse(final_url).netloc
+                    if seo_data is None or depth == self.max_depth:
+                        continue
+                    for link in links:
+                        link = self._normalize(link)
+                        key = self._visit_key(link)
+                        if key not in seen and self._is_crawlable(link, host):
+                            seen.add(key)
+                            if submitted < self.max_pages:
+                                submitted += 1
+                                in_flight[pool.submit(self._analyze, link)] = (link, depth + 1)
+
+        elapsed = time.perf_counter() - start
+        return {
+            'url': start_url,
+            'timestamp': started.isoformat(),
+            'crawl': {
+                'max_depth': self.max_depth,
+                'max_pages': self.max_pages,
+                'pages_crawled': len(pages),
+                'pages_discovered': len(seen),
+                'wall_seconds': round(elapsed, 3),
+                'pages_per_minute': round(len(pages) / elapsed * 60, 2) if elapsed > 0 else None
+            },
+            'site': self._aggregate(pages),
+            'http_cache': http_cache.stats(),
+            'http_client': http_client.stats(),
+            'pages': pages
+        }
+
+    def _analyze(self, url):
+        """Fetch and analyze one page
+
+        Returns its SEO data or None, its URL after redirects and the absolute
+        URLs of all its links.
+        """
+        collector = getattr(self._local, 'collector', None)
+        if collector is None:
+            collector = self._local.collector = SEOCollector()
+            collector.weights = self.score_weights
+
+        snapshot = PageSnapshot(url, collector.headers)
+        try:
+            response = snapshot.response
+        except Exception as e:
+            print(f"Error fetching {url}: {str(e)}")
+            return None, url, []
+        final_url = response.url or url
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and 'html' not in content_type:
+            return None, final_url, []
+        seo_data = collector.collect_data(url, snapshot=snapshot, conclusion=self.llm)
+        if seo_data is None:
+            return None, final_url, []
+        # Relative links (about.html, ../shop/, ?page=2) resolve against the final URL
+        links = [urljoin(final_url, link['href']) for link in snapshot.features.all('a') if link.has_attr('href')]
+        return seo_data, final_url, links
+
+    def _normalize(self, url):
+        """Strip the fragment, lower-case the scheme and host and drop a default port"""
+        parsed = urlparse(urldefrag(url)[0])
+        scheme = parsed.scheme.lower()
+        netloc = parsed.netloc.lower()
+        if (scheme, netloc.rpartition(':')[2]) in (('http', '80'), ('https', '443')):
+            netloc = netloc.rpartition(':')[0]
+        return urlunparse(parsed._replace(scheme=scheme, netloc=netloc, path=parsed.path or '/'))
+
+    def _visit_key(self, url):
+        """Key of a normalized URL in the visited set, so /about and /about/ are crawled once"""
+        parsed = urlparse(url)
+        return urlunparse(parsed._replace(path=parsed.path.rstrip('/') or '/'))
+
+    def _is_crawlable(self, url, host):
+        """Only follow http(s) links to HTML pages on exactly the same host"""
+        parsed = urlparse(url)
+        return (
+            parsed.scheme in ('http', 'https')
+            and parsed.netloc == host
+            and not parsed.path.lower().endswith(SKIPPED_EXTENSIONS)
+        )
+
+    def _aggregate(self, pages):
+        """Aggregate per-page scores and common issues into site-level figures"""
+        analyzed = {url: page['seo'] for url, page in pages.items() if page['seo'] is not None}
+
+        scores = {}
+        for key in SCORE_KEYS:
+            values = [seo['score'][key]['value'] for seo in analyzed.values()]
+            scores[key] = {
+                'average': round(sum(values) / len(values), 1) if values else None,
+                'min': min(values) if values else None,
+                'max': max(values) if values else None
+            }
+
+        titles = Counter(seo['meta_tags']['title'] for seo in analyzed.values() if seo['meta_tags']['title'])
+        worst_pages = sorted(analyzed, key=lambda url: analyzed[url]['score']['overall']['value'])[:10]
+
+        return {
+            'pages_analyzed': len(analyzed),
+            'pages_failed': len(pages) - len(analyzed),
+            'scores': scores,
+            'issues': {
+                'missing_title': sum(1 for seo in analyzed.values() if not seo['meta_tags']['title']),
+                'missing_meta_description': sum(1 for seo in analyzed.values() if not seo['meta_tags']['meta_description']),
+                'multiple_h1': sum(1 for seo in analyzed.values() if seo['headings']['h1']['count'] > 1),
+                'no_h1': sum(1 for seo in analyzed.values() if seo['headings']['h1']['count'] == 0),
+                'images_without_alt': sum(seo['images']['without_alt'] for seo in analyzed.values()),
+                'duplicate_titles': {title: count for title, count in titles.items() if count > 1}
+            },
+            'worst_pages': [
+                {'url': url, 'overall': analyzed[url]['score']['overall']['value']}
+                for url in worst_pages
+            ]
+        }
@@ -0,0 +1,22 @@
+import hashlib
+import json
+
+# Collectors whose section is fully determined by the page HTML, and can be
+# reused when the HTML has not changed
+HTML_SECTIONS = ('seo', 'content')
+
+
+def fingerprint(value):
+    """Stable SHA-256 hex digest of bytes, text or JSON-serializable data"""
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    elif not isinstance(value, bytes):
+        value = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha256(value).hexdigest()
+
+
+def previous_fingerprints(report):
+    """Fingerprints recorded in a stored report, or an empty dict"""
+    if not report:
+        return {}
+    return report.get('fingerprints') or {}
@@ -0,0 +1,108 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path("cache/hosts.sqlite")
+
+# Seconds a host-level result stays fresh, per check
+DEFAULT_TTLS = {
+    'ssl_info': 24 * 3600,
+    'robots_txt': 3600,
+    'sitemap': 3600,
+    'mozilla_observatory': 24 * 3600
+}
+
+
+class HostCache:
+    """Persistent cache of check results that depend only on the host
+
+    Results are keyed by check name and host and expire after the check's
+    TTL. Concurrent lookups of the same missing key wait for the first one
+    to compute it, so a batch auditing many pages of one site runs each
+    check once.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttls=None):
+        self.path = Path(path)
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("""CREATE TABLE IF NOT EXISTS host_results (
+            check_name TEXT NOT NULL,
+            host TEXT NOT NULL,
+            value TEXT NOT NULL,
+            stored_at REAL NOT NULL,
+            PRIMARY KEY (check_name, host)
+        )""")
+        self._db.commit()
+
+    def get_or_compute(self, check_name, host, compute, cacheable=lambda value: value is not None):
+        """Return (value, origin) for a check on a host, calling compute() on a miss
+
+        origin says where the value came from: {'source': 'cache' or 'live',
+        'host', 'age_seconds', 'ttl_seconds'}. Values rejected by cacheable
+        (by default None) are returned but not stored.
+        """
+        ttl = self.ttls.get(check_name, 0)
+        with self._lock:
+            key_lock = self._key_locks.setdefault((check_name, host), threading.Lock())
+
+        with key_lock:
+            cached = self._load(check_name, host, ttl)
+            if cached is not None:
+                value, age = cached
+                with self._lock:
+                    self.hits += 1
+                return value, {'source': 'cache', 'host': host, 'age_seconds': round(age, 1), 'ttl_seconds': ttl}
+
+            with self._lock:
+                self.misses += 1
+            value = compute()
+            if ttl > 0 and cacheable(value):
+                self._store(check_name, host, value)
+            return value, {'source': 'live', 'host': host, 'age_seconds': 0, 'ttl_seconds': ttl}
+
+    def stats(self):
+        """Hit/miss counters and number of stored results"""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM host_results").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'entries': entries
+        }
+
+    def _load(self, check_name, host, ttl):
+        """Return (value, age_seconds) if a fresh entry exists, else None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, stored_at FROM host_results WHERE check_name = ? AND host = ?",
+                (check_name, host)
+            ).fetchone()
+        if row is None:
+            return None
+        age = time.time() - row[1]
+        if age > ttl:
+            return None
+        return json.loads(row[0]), age
+
+    def _store(self, check_name, host, value):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO host_results (check_name, host, value, stored_at) VALUES (?, ?, ?, ?)",
+                (check_name, host, json.dumps(value), time.time())
+            )
+            self._db.commit()
+
+
+# Shared by every TechnicalCollector in the process
+host_cache = HostCache()
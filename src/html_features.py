@@ -0,0 +1,48 @@
+from collections import defaultdict
+from bs4 import Tag
+
+
+class HtmlFeatures:
+    """Every tag of a parsed page, bucketed by name in a single traversal
+
+    Collectors used to call soup.find_all once per tag name they were
+    interested in, each call walking the whole tree. Walking it once and
+    bucketing tags by name (plus the few attribute-based selections the
+    collectors make) gives the same tags, in document order, for the cost of
+    one traversal.
+    """
+
+    def __init__(self, soup):
+        self._tags = defaultdict(list)
+        self.with_role = []
+        self.with_itemtype = []
+
+        for node in soup.descendants:
+            if not isinstance(node, Tag):
+                continue
+            self._tags[node.name].append(node)
+            attrs = node.attrs
+            if 'role' in attrs:
+                self.with_role.append(node)
+            if 'itemtype' in attrs:
+                self.with_itemtype.append(node)
+
+    def all(self, name):
+        """All tags with the given name, in document order"""
+        return self._tags.get(name, [])
+
+    def count(self, *names):
+        """Number of tags with any of the given names"""
+        return sum(len(self._tags.get(name, [])) for name in names)
+
+    def first(self, tag_name, **attrs):
+        """First tag with the given name whose attributes equal attrs, or None"""
+        for tag in self._tags.get(tag_name, []):
+            if all(tag.get(key) == value for key, value in attrs.items()):
+                return tag
+        return None
+
+    @property
+    def title(self):
+        """The first <title> tag, as soup.title returns it"""
+        return self.first('title')
@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from src.http_client import http_client
+
+DEFAULT_CACHE_DIR = Path("cache/http")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class HttpCache:
+    """On-disk HTTP cache that revalidates with ETag and Last-Modified
+
+    Responses carrying a validator are stored on disk, unless marked
+    Cache-Control: no-store or private. The next request for the same URL is
+    sent with If-None-Match / If-Modified-Since, and on a 304 the stored body
+    is served instead of downloading it again.
+
+    Bodies are kept within max_bytes by evicting the least recently used
+    entries. The directory is only created on the first write.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Bytes of the bodies on disk, unknown until the first write scans them
+        self._size = None
+        self.requests = 0
+        self.revalidated = 0
+        self.stored = 0
+        self.evictions = 0
+        self.bytes_downloaded = 0
+        self.bytes_saved = 0
+
+    def get(self, url, headers=None, **kwargs):
+        """GET a URL, revalidating against the cached copy when there is one"""
+        entry = self._load(url)
+        response = http_client.get(url, headers=self._conditional_headers(entry, headers), **kwargs)
+
+        with self._lock:
+            self.requests += 1
+            if response.status_code == 304 and entry is not None:
+                self.revalidated += 1
+                self.bytes_saved += entry['size']
+            else:
+                self.bytes_downloaded += len(response.content)
+
+        if response.status_code == 304 and entry is not None:
+            return self._build_response(url, entry, response)
+
+        if self._cacheable(response):
+            self._store(url, response.headers, [response.content])
+        return response
+
+    def open_stream(self, url, headers=None, chunk_size=64 * 1024, **kwargs):
+        """GET a URL for incremental reading; returns (status_code, binary file object)
+
+        The body is never held in memory as a whole. On a 304 the cached body
+        is opened from disk; a 200 with validators is written to the cache in
+        chunks and then read back from disk.
+        """
+        entry = self._load(url)
+        response = http_client.get(url, headers=self._conditional_headers(entry, headers), stream=True, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            with self._lock:
+                self.requests += 1
+                self.revalidated += 1
+                self.bytes_saved += entry['size']
+            body_path = self._paths(url)[1]
+            self._touch(body_path)
+            return 200, open(body_path, 'rb')
+
+        if self._cacheable(response):
+            with response:
+                size = self._store(url, response.headers, response.raw.stream(chunk_size, decode_content=True))
+            with self._lock:
+                self.requests += 1
+                self.bytes_downloaded += size
+            return 200, open(self._paths(url)[1], 'rb')
+
+        with self._lock:
+            self.requests += 1
+        # Not cacheable: stream straight from the connection, undoing any
+        # transport compression
+        response.raw.decode_content = True
+        return response.status_code, response.raw
+
+    def stats(self):
+        """Revalidation hit rate and bandwidth saved so far in this process"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'revalidated': self.revalidated,
+                'hit_rate': round(self.revalidated / self.requests, 3) if self.requests else None,
+                'stored': self.stored,
+                'evictions': self.evictions,
+                'bytes_downloaded': self.bytes_downloaded,
+                'bytes_saved': self.bytes_saved
+            }
+
+    def _cacheable(self, response):
+        """Whether a response may be stored: a 200 with a validator, not marked no-store or private"""
+        if response.status_code != 200:
+            return False
+        if not (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            return False
+        directives = {
+            directive.split('=', 1)[0].strip().lower()
+            for directive in response.headers.get('Cache-Control', '').split(',')
+        }
+        return not directives & {'no-store', 'private'}
+
+    def _conditional_headers(self, entry, headers):
+        """Request headers with the validators of a cached entry added"""
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+        return request_headers
+
+    def _paths(self, url):
+        """Metadata and body file paths for a URL"""
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def _load(self, url):
+        """Return the cached metadata for a URL, or None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url or not body_path.exists():
+            return None
+        return entry
+
+    def _store(self, url, headers, chunks):
+        """Write a body, given as chunks of bytes, and its validators to disk; returns its size"""
+        meta_path, body_path = self._paths(url)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to temporary files and rename so concurrent readers never see
+        # a partial entry
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        body_tmp = body_path.with_name(body_path.name + suffix)
+        meta_tmp = meta_path.with_name(meta_path.name + suffix)
+        size = 0
+        with open(body_tmp, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        entry = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'headers': dict(headers),
+            'size': size
+        }
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(body_tmp, body_path)
+        os.replace(meta_tmp, meta_path)
+        with self._lock:
+            self.stored += 1
+            if self._size is None or self._size + size > self.max_bytes:
+                self._size = self._evict(keep=body_path)
+            else:
+                self._size += size
+        return size
+
+    def _evict(self, keep):
+        """Delete the least recently used entries, other than keep, until the bodies
+        fit in max_bytes; returns the bytes left on disk"""
+        entries = []
+        for body_path in self.cache_dir.glob('*.body'):
+            try:
+                stat = body_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, body_path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if body_path == keep:
+                continue
+            body_path.with_suffix('.json').unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        return total
+
+    def _touch(self, body_path):
+        """Mark an entry as just used for eviction"""
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+
+    def _build_response(self, url, entry, not_modified):
+        """Build a 200 response from a cached entry after a 304"""
+        _, body_path = self._paths(url)
+        self._touch(body_path)
+        response = requests.Response()
+        response.status_code = 200
+        # The URL after any redirects, as for a downloaded response
+        response.url = not_modified.url or url
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        # Validators may have been refreshed by the 304
+        for name in ('ETag', 'Last-Modified', 'Date', 'Cache-Control', 'Expires'):
+            if name in not_modified.headers:
+                response.headers[name] = not_modified.headers[name]
+        with open(body_path, 'rb') as f:
+            response._content = f.read()
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.request = not_modified.request
+        response.from_cache = True
+        return response
+
+
+# Shared by every collector in the process
+http_cache = HttpCache()
@@ -0,0 +1,119 @@
+import os
+import threading
+from urllib.parse import urlparse
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+load_dotenv()
+
+USER_AGENT = os.getenv(
+    'USER_AGENT',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+# Seconds to wait for a connection and then for each read from the socket
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 30))
+# Retries on connection errors and on 429/5xx responses, with exponential
+# backoff (backoff_factor * 2 ** attempt seconds, or Retry-After if sent).
+# POST is only retried when the connection failed, so it is never sent twice
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', 0.5))
+# Keep-alive connections kept open per host; should be at least the number
+# of worker threads that may hit one host at once
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 10))
+# Number of hosts whose connection pools are kept
+HTTP_POOL_HOSTS = int(os.getenv('HTTP_POOL_HOSTS', 100))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpClient:
+    """One pooled requests.Session shared by every collector
+
+    Connections are kept alive per host, every request gets a connect and
+    read timeout unless it passes its own, and connection errors and 429/5xx
+    responses are retried with backoff (POST only on connection errors). When retries run out the last
+    response is returned, so callers keep checking status_code as before.
+    """
+
+    def __init__(self, user_agent=USER_AGENT, connect_timeout=HTTP_CONNECT_TIMEOUT,
+                 read_timeout=HTTP_READ_TIMEOUT, max_retries=HTTP_MAX_RETRIES,
+                 backoff_factor=HTTP_BACKOFF_FACTOR, pool_maxsize=HTTP_POOL_MAXSIZE,
+                 pool_hosts=HTTP_POOL_HOSTS):
+        self.user_agent = user_agent
+        self.timeout = (connect_timeout, read_timeout)
+        self._lock = threading.Lock()
+        self.retries = {}
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            # urllib3 retries failed connections for any method, and read
+            # errors and retry statuses only for these idempotent ones
+            allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self._adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        self.session.mount('http://', self._adapter)
+        self.session.mount('https://', self._adapter)
+
+    def request(self, method, url, **kwargs):
+        """Send a request through the shared session with the default timeouts"""
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.request(method, url, **kwargs)
+        retries = getattr(response.raw, 'retries', None)
+        if retries is not None and retries.history:
+            parsed = urlparse(url)
+            host = _origin(parsed.scheme, parsed.hostname, parsed.port)
+            with self._lock:
+                self.retries[host] = self.retries.get(host, 0) + len(retries.history)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def stats(self):
+        """Requests, new connections and connection reuse per origin (scheme://host[:port])"""
+        pools = self._adapter.poolmanager.pools
+        hosts = {}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = _origin(pool.scheme, pool.host, pool.port)
+            requests_sent = pool.num_requests
+            connections = pool.num_connections
+            hosts[host] = {
+                'requests': requests_sent,
+                'connections': connections,
+                'reused': max(requests_sent - connections, 0),
+                'reuse_rate': round(1 - connections / requests_sent, 3) if requests_sent else None,
+                'retries': self.retries.get(host, 0)
+            }
+        return {
+            'requests': sum(h['requests'] for h in hosts.values()),
+            'connections': sum(h['connections'] for h in hosts.values()),
+            'hosts': hosts
+        }
+
+
+def _origin(scheme, host, port):
+    """scheme://host, with the port unless it is the scheme's default"""
+    scheme = scheme.lower()
+    host = (host or '').lower()
+    if port is None or (scheme, port) in (('http', 80), ('https', 443)):
+        return f"{scheme}://{host}"
+    return f"{scheme}://{host}:{port}"
+
+
+# Shared by every collector in the process
+http_client = HttpClient()
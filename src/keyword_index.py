@@ -0,0 +1,379 @@
+"""Site-wide keyword index: TF-IDF top terms per page and keyword -> pages lookups
+
+Pages are rows of a sparse page x term matrix of word and bigram counts,
+kept as growing CSR arrays (row pointers, term ids, counts). Adding a page
+appends one row and updates the document frequencies; nothing is rebuilt.
+Re-adding a URL replaces its row, leaving the old one as a tombstone until
+compaction.
+
+Keyword lookups use the transposed (term x page) view. It is rebuilt lazily,
+only once the rows added since the last build grow past a fraction of the
+index, and those newer rows are scanned directly in the meantime.
+
+The postings take about 16 bytes per kept term, counting both views, plus
+the spare capacity of the growing arrays, and the vocabulary stops growing
+at max_terms. Every distinct term of a page is kept by default, so the
+scores are exact; terms_per_page caps the postings of each page, trading
+accuracy for memory: at 50 terms, 100k pages measured about 110 MB of
+arrays, plus the vocabulary.
+
+Build an index from the content sections of stored reports, then query it:
+
+    python -m src.keyword_index build reports/keywords.npz [--store reports/reports.sqlite]
+    python -m src.keyword_index query reports/keywords.npz [--page URL] [--keyword TERM] [--shared]
+"""
+import argparse
+import threading
+from collections import Counter
+from pathlib import Path
+import numpy as np
+
+DEFAULT_INDEX_PATH = Path("reports/keywords.npz")
+
+# Rebuild the keyword -> pages view once this share of the rows is newer than it
+TRANSPOSE_TAIL_RATIO = 0.25
+TRANSPOSE_MIN_TAIL = 1000
+
+
+def page_terms(words):
+    """Words and bigrams of a page, bigrams joined with a space as in ContentCollector"""
+    return list(words) + [' '.join(bigram) for bigram in zip(words[:-1], words[1:])]
+
+
+class KeywordIndex:
+    """Incremental sparse page x term index with TF-IDF scoring
+
+    terms_per_page, if set, keeps only that many terms of each page: those
+    with the highest TF-IDF against the document frequencies known when the
+    page is added. This bounds memory, but scores become approximate, since
+    a term dropped from a page no longer counts towards its document
+    frequency, and early pages are selected against few others.
+    """
+
+    def __init__(self, max_terms=200000, terms_per_page=None):
+        self.max_terms = max_terms
+        self.terms_per_page = terms_per_page
+        self._lock = threading.RLock()
+
+        self._vocabulary = {}
+        self._terms = []
+        self._document_frequency = np.zeros(1024, dtype=np.int32)
+        self.dropped_terms = 0
+
+        # One row per added page, including replaced ones
+        self._urls = []
+        self._rows = {}
+        self._live = np.zeros(1024, dtype=bool)
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._indptr = np.zeros(1025, dtype=np.int64)
+        self._indices = np.zeros(16384, dtype=np.int32)
+        self._counts = np.zeros(16384, dtype=np.float32)
+
+        # Term -> rows view of the first _transposed_rows rows
+        self._transposed = None
+        self._transposed_rows = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, url):
+        return url in self._rows
+
+    def add_page(self, url, words):
+        """Index a page's content words, replacing any earlier version of the URL"""
+        terms = page_terms(words)
+        term_counts = Counter(terms)
+
+        with self._lock:
+            if url in self._rows:
+                self._remove(url)
+
+            kept = term_counts.items()
+            if self.terms_per_page and len(term_counts) > self.terms_per_page:
+                kept = self._most_distinctive(term_counts)
+            ids, counts = [], []
+            for term, count in kept:
+                term_id = self._vocabulary.get(term)
+                if term_id is None:
+                    if len(self._terms) >= self.max_terms:
+                        self.dropped_terms += 1
+                        continue
+                    term_id = self._vocabulary[term] = len(self._terms)
+                    self._terms.append(term)
+                ids.append(term_id)
+                counts.append(count)
+            order = np.argsort(ids)
+            ids = np.array(ids, dtype=np.int32)[order]
+            counts = np.array(counts, dtype=np.float32)[order]
+
+            row = len(self._urls)
+            start = self._indptr[row]
+            end = start + len(ids)
+            self._reserve(row + 1, end, len(self._terms))
+            self._indices[start:end] = ids
+            self._counts[start:end] = counts
+            self._indptr[row + 1] = end
+            self._lengths[row] = max(len(terms), 1)
+            self._live[row] = True
+            self._document_frequency[ids] += 1
+            self._urls.append(url)
+            self._rows[url] = row
+
+            # Keep tombstones from outgrowing the pages they replaced
+            if len(self._urls) - len(self._rows) > max(len(self._rows), TRANSPOSE_MIN_TAIL):
+                self.compact()
+
+    def top_terms(self, url, limit=10):
+        """The terms most distinctive of a page by TF-IDF, as (term, score) pairs"""
+        with self._lock:
+            row = self._rows.get(url)
+            if row is None:
+                return []
+            start, end = self._indptr[row], self._indptr[row + 1]
+            ids = self._indices[start:end]
+            scores = self._counts[start:end] / self._lengths[row] * self._idf(ids)
+            best = np.argsort(-scores, kind='stable')[:limit]
+            return [(self._terms[ids[i]], round(float(scores[i]), 6)) for i in best]
+
+    def pages_for(self, keyword, limit=10):
+        """Pages containing a word or bigram, highest TF-IDF first
+
+        Several pages ranking for the same keyword compete with each other.
+        """
+        with self._lock:
+            term_id = self._vocabulary.get(keyword.lower())
+            if term_id is None:
+                return []
+            rows, counts = self._postings(term_id)
+            live = self._live[rows]
+            rows, counts = rows[live], counts[live]
+            scores = counts / self._lengths[rows] * self._idf(np.array([term_id]))[0]
+            best = np.argsort(-scores, kind='stable')[:limit]
+            return [
+                {'url': self._urls[rows[i]], 'count': int(counts[i]), 'tfidf': round(float(scores[i]), 6)}
+                for i in best
+            ]
+
+    def shared_terms(self, limit=20, min_pages=2):
+        """Terms found on the most pages, as (term, page count) pairs"""
+        with self._lock:
+            frequency = self._document_frequency[:len(self._terms)]
+            candidates = np.flatnonzero(frequency >= min_pages)
+            best = candidates[np.argsort(-frequency[candidates], kind='stable')[:limit]]
+            return [(self._terms[i], int(frequency[i])) for i in best]
+
+    def compact(self):
+        """Drop the rows of replaced pages"""
+        with self._lock:
+            rows = len(self._urls)
+            nnz = int(self._indptr[rows])
+            keep = np.flatnonzero(self._live[:rows])
+            row_lengths = np.diff(self._indptr[:rows + 1])
+            live_entries = np.repeat(self._live[:rows], row_lengths)
+            lengths = row_lengths[keep]
+            indices = self._indices[:nnz][live_entries]
+            counts = self._counts[:nnz][live_entries]
+            self._indptr = np.zeros(max(len(keep), 1024) + 1, dtype=np.int64)
+            self._indptr[1:len(keep) + 1] = np.cumsum(lengths)
+            self._indices = np.zeros(max(len(indices), 16384), dtype=np.int32)
+            self._indices[:len(indices)] = indices
+            self._counts = np.zeros(len(self._indices), dtype=np.float32)
+            self._counts[:len(counts)] = counts
+            self._lengths = self._resized(self._lengths[keep], len(self._indptr) - 1)
+            self._live = self._resized(np.ones(len(keep), dtype=bool), len(self._indptr) - 1)
+            self._urls = [self._urls[row] for row in keep]
+            self._rows = {url: row for row, url in enumerate(self._urls)}
+            self._transposed = None
+            self._transposed_rows = 0
+
+    def stats(self):
+        """Page, term and posting counts and the memory held by the arrays"""
+        with self._lock:
+            arrays = [self._document_frequency, self._live, self._lengths, self._indptr, self._indices, self._counts]
+            if self._transposed is not None:
+                arrays += list(self._transposed)
+            return {
+                'pages': len(self._rows),
+                'replaced_rows': len(self._urls) - len(self._rows),
+                'terms': len(self._terms),
+                'dropped_terms': self.dropped_terms,
+                'postings': int(self._indptr[len(self._urls)]),
+                'array_bytes': sum(array.nbytes for array in arrays)
+            }
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        """Write the index, without replaced rows, as a compressed .npz file"""
+        with self._lock:
+            self.compact()
+            rows = len(self._urls)
+            nnz = int(self._indptr[rows])
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            np.savez_compressed(
+                path,
+                # 0 for no terms_per_page limit
+                settings=np.array([self.max_terms, self.terms_per_page or 0, self.dropped_terms], dtype=np.int64),
+                terms=_pack(self._terms),
+                urls=_pack(self._urls),
+                document_frequency=self._document_frequency[:len(self._terms)],
+                lengths=self._lengths[:rows],
+                indptr=self._indptr[:rows + 1],
+                indices=self._indices[:nnz],
+                counts=self._counts[:nnz]
+            )
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        """Read an index written by save()"""
+        with np.load(path) as data:
+            max_terms, terms_per_page, dropped_terms = (int(value) for value in data['settings'])
+            index = cls(max_terms=max_terms, terms_per_page=terms_per_page or None)
+            index.dropped_terms = dropped_terms
+            index._terms = _unpack(data['terms'])
+            index._vocabulary = {term: i for i, term in enumerate(index._terms)}
+            index._urls = _unpack(data['urls'])
+            index._rows = {url: row for row, url in enumerate(index._urls)}
+            rows = len(index._urls)
+            index._reserve(rows, len(data['indices']), len(index._terms))
+            index._document_frequency[:len(index._terms)] = data['document_frequency']
+            index._lengths[:rows] = data['lengths']
+            index._live[:rows] = True
+            index._indptr[:rows + 1] = data['indptr']
+            index._indices[:len(data['indices'])] = data['indices']
+            index._counts[:len(data['counts'])] = data['counts']
+        return index
+
+    def _most_distinctive(self, term_counts):
+        """The terms_per_page (term, count) pairs of a new page with the highest TF-IDF"""
+        terms = list(term_counts)
+        frequency = np.array(
+            [self._document_frequency[self._vocabulary[term]] if term in self._vocabulary else 0 for term in terms]
+        )
+        # As _idf() will give once the page is added
+        idf = np.log((2 + len(self._rows)) / (2 + frequency)) + 1
+        scores = np.array([term_counts[term] for term in terms]) * idf
+        best = np.argsort(-scores, kind='stable')[:self.terms_per_page]
+        return [(terms[i], term_counts[terms[i]]) for i in best]
+
+    def _remove(self, url):
+        row = self._rows.pop(url)
+        self._live[row] = False
+        self._document_frequency[self._indices[self._indptr[row]:self._indptr[row + 1]]] -= 1
+
+    def _idf(self, ids):
+        """Smoothed inverse document frequency of term ids"""
+        pages = len(self._rows)
+        return np.log((1 + pages) / (1 + self._document_frequency[ids])).astype(np.float32) + 1
+
+    def _postings(self, term_id):
+        """Rows and counts of every row containing term_id, replaced ones included"""
+        rows = len(self._urls)
+        tail = rows - self._transposed_rows
+        if self._transposed is None or tail > max(TRANSPOSE_MIN_TAIL, TRANSPOSE_TAIL_RATIO * rows):
+            self._transpose()
+
+        found_rows, found_counts = [], []
+        if self._transposed is not None:
+            indptr, term_rows, term_counts = self._transposed
+            if term_id < len(indptr) - 1:
+                found_rows.append(term_rows[indptr[term_id]:indptr[term_id + 1]])
+                found_counts.append(term_counts[indptr[term_id]:indptr[term_id + 1]])
+
+        # Rows added since the view was built
+        start, end = self._indptr[self._transposed_rows], self._indptr[rows]
+        positions = start + np.flatnonzero(self._indices[start:end] == term_id)
+        found_rows.append(np.searchsorted(self._indptr[:rows + 1], positions, side='right') - 1)
+        found_counts.append(self._counts[positions])
+        return np.concatenate(found_rows).astype(np.int64), np.concatenate(found_counts)
+
+    def _transpose(self):
+        rows = len(self._urls)
+        nnz = int(self._indptr[rows])
+        indices = self._indices[:nnz]
+        order = np.argsort(indices, kind='stable')
+        row_of_entry = np.repeat(np.arange(rows, dtype=np.int32), np.diff(self._indptr[:rows + 1]))
+        indptr = np.zeros(len(self._terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=len(self._terms)), out=indptr[1:])
+        self._transposed = (indptr, row_of_entry[order], self._counts[:nnz][order])
+        self._transposed_rows = rows
+
+    def _reserve(self, rows, postings, terms):
+        """Grow the arrays, doubling their capacity, to fit the given sizes"""
+        if rows + 1 > len(self._indptr):
+            capacity = _capacity(len(self._indptr) - 1, rows)
+            self._indptr = self._resized(self._indptr, capacity + 1)
+            self._lengths = self._resized(self._lengths, capacity)
+            self._live = self._resized(self._live, capacity)
+        if postings > len(self._indices):
+            capacity = _capacity(len(self._indices), postings)
+            self._indices = self._resized(self._indices, capacity)
+            self._counts = self._resized(self._counts, capacity)
+        if terms > len(self._document_frequency):
+            self._document_frequency = self._resized(
+                self._document_frequency, _capacity(len(self._document_frequency), terms)
+            )
+
+    @staticmethod
+    def _resized(array, size):
+        resized = np.zeros(size, dtype=array.dtype)
+        resized[:min(len(array), size)] = array[:size]
+        return resized
+
+
+def _capacity(current, needed):
+    return max(needed, current * 2)
+
+
+def _pack(strings):
+    """Newline-joined UTF-8 bytes; terms and URLs never contain a newline"""
+    return np.frombuffer('\n'.join(strings).encode('utf-8'), dtype=np.uint8)
+
+
+def _unpack(data):
+    text = data.tobytes().decode('utf-8')
+    return text.split('\n') if text else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the site-wide keyword index')
+    parser.add_argument('command', choices=['build', 'query'])
+    parser.add_argument('index', nargs='?', default=str(DEFAULT_INDEX_PATH), help='Path of the index file')
+    parser.add_argument('--store', help='Report store to build from (build)')
+    parser.add_argument('--page', help='Show the most distinctive terms of this URL (query)')
+    parser.add_argument('--keyword', help='Show the pages competing for this word or bigram (query)')
+    parser.add_argument('--shared', action='store_true', help='Show the terms found on the most pages (query)')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        from src.nltk_resources import english_stop_words
+        from src.report_store import DEFAULT_STORE_PATH, ReportStore
+        from src.text_document import TextDocument
+
+        stop_words = english_stop_words()
+        index = KeywordIndex()
+        # Oldest first, so each URL ends up indexed from its latest report
+        for report in ReportStore(args.store or DEFAULT_STORE_PATH).iter_reports():
+            text = ((report.get('data') or {}).get('content') or {}).get('main_content')
+            if text:
+                index.add_page(report['url'], TextDocument(text, stop_words).content_words)
+        index.save(args.index)
+        print(f"Indexed {len(index)} pages into {args.index}: {index.stats()}")
+        return
+
+    index = KeywordIndex.load(args.index)
+    if args.page:
+        for term, score in index.top_terms(args.page, args.limit):
+            print(f"{score:10.4f}  {term}")
+    if args.keyword:
+        for page in index.pages_for(args.keyword, args.limit):
+            print(f"{page['tfidf']:10.4f}  {page['count']:5d}  {page['url']}")
+    if args.shared:
+        for term, pages in index.shared_terms(args.limit):
+            print(f"{pages:6d}  {term}")
+    if not (args.page or args.keyword or args.shared):
+        print(index.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+import threading
+import time
+from src.model_registry import get_model
+from src.tracing import record_usage, span
+
+
+class CompletionBatch:
+    """Queue completion prompts from many collector runs and evaluate them together
+
+    Each submission is a dict of section key -> (prompt, max_tokens) plus a
+    callback that receives a dict of section key -> completion text. Identical
+    prompts across submissions are evaluated once, and prompts are evaluated in
+    sorted order so prompts sharing a prefix run back to back and llama.cpp can
+    reuse the prefix already held in its KV cache.
+    """
+
+    def __init__(self, model_path, completion_params, n_ctx=4096, n_threads=4, cache=None):
+        self.model_path = model_path
+        self.cache = cache
+        self.completion_params = completion_params
+        self.n_ctx = n_ctx
+        self.n_threads = n_threads
+        self._requests = []
+        self._lock = threading.Lock()
+
+    def submit(self, prompts, callback):
+        """Queue a set of prompts; callback is called with the completions after run()"""
+        with self._lock:
+            self._requests.append((prompts, callback))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._requests)
+
+    def run(self, measure_sequential=False):
+        """Evaluate every queued prompt, dispatch the results and return throughput stats"""
+        with self._lock:
+            requests, self._requests = self._requests, []
+
+        unique = {}
+        for prompts, _ in requests:
+            for prompt, max_tokens in prompts.values():
+                unique.setdefault((prompt, max_tokens), None)
+
+        results = {}
+        usage = {}
+        misses = []
+        model_seconds = 0.0
+        start = time.perf_counter()
+        for prompt, max_tokens in sorted(unique):
+            completion_start = time.perf_counter()
+            text, tokens, hit = self._complete(prompt, max_tokens)
+            if not hit:
+                misses.append((prompt, max_tokens))
+                model_seconds += time.perf_counter() - completion_start
+            results[(prompt, max_tokens)] = text
+            usage[(prompt, max_tokens)] = tokens
+        elapsed = time.perf_counter() - start
+
+        for prompts, callback in requests:
+            try:
+                callback({
+                    key: results[(prompt, max_tokens)]
+                    for key, (prompt, max_tokens) in prompts.items()
+                })
+            except Exception as e:
+                print(f"Error dispatching batched completions: {str(e)}")
+
+        # Tokens the callers asked for, counting duplicates, split into what
+        # dedup and the completion cache saved and what the model processed
+        requested_tokens = sum(
+            sum(usage[(prompt, max_tokens)]) for prompts, _ in requests
+            for prompt, max_tokens in prompts.values()
+        )
+        unique_tokens = sum(sum(tokens) for tokens in usage.values())
+        model_tokens = sum(sum(usage[key]) for key in misses)
+
+        stats = {
+            'submissions': len(requests),
+            'prompts_requested': sum(len(prompts) for prompts, _ in requests),
+            'prompts_unique': len(unique),
+            'cache_hits': len(unique) - len(misses),
+            'cache_misses': len(misses),
+            'requested_tokens': requested_tokens,
+            'dedup_tokens_saved': requested_tokens - unique_tokens,
+            'cache_tokens_saved': unique_tokens - model_tokens,
+            'model_tokens': model_tokens,
+            'elapsed_seconds': round(elapsed, 3),
+            'model_seconds': round(model_seconds, 3),
+            # Throughput of the completions the model evaluated; None when
+            # everything came from dedup or the cache
+            'tokens_per_second': round(model_tokens / model_seconds, 1) if misses and model_seconds > 0 else None,
+            'sequential_tokens_per_second': None,
+            'speedup': None
+        }
+
+        if measure_sequential and misses:
+            sequential = self._measure_sequential(misses)
+            stats['sequential_tokens_per_second'] = sequential
+            if sequential and stats['tokens_per_second']:
+                stats['speedup'] = round(stats['tokens_per_second'] / sequential, 2)
+
+        return stats
+
+    def _model(self):
+        """The shared model, loaded on first use so cached runs never load it"""
+        return get_model(self.model_path, n_ctx=self.n_ctx, n_threads=self.n_threads)
+
+    def _complete(self, prompt, max_tokens, use_cache=True):
+        """Run one completion and return its text, (prompt, completion) token
+        counts and whether it was served from the cache"""
+        params = dict(self.completion_params, max_tokens=max_tokens)
+        try:
+            with span('llm.completion', batched=True, max_tokens=max_tokens) as attributes:
+                start = time.perf_counter()
+                if self.cache is not None and use_cache:
+                    response, hit = self.cache.complete(self._model, self.model_path, prompt, params)
+                else:
+                    response, hit = self._model().create_completion(prompt, **params), False
+                record_usage(attributes, response, hit, time.perf_counter() - start)
+            usage = response.get('usage', {})
+            return (
+                response['choices'][0]['text'].strip(),
+                (usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0)),
+                hit
+            )
+        except Exception as e:
+            print(f"Error running batched completion: {str(e)}")
+            return '', (0, 0), False
+
+    def _measure_sequential(self, prompts):
+        """Replay the prompts the batch evaluated one at a time, as generate_conclusion
+        does, and return the tokens/sec of that path
+
+        Only the batch's cache misses are replayed, once each, so both paths
+        process the same tokens; the completion cache is bypassed because the
+        batch has just filled it with these prompts.
+        """
+        llm = self._model()
+        tokens = 0
+        start = time.perf_counter()
+        for prompt, max_tokens in prompts:
+            # Drop any cached prefix so each prompt is evaluated from scratch
+            if hasattr(llm, 'reset'):
+                llm.reset()
+            tokens += sum(self._complete(prompt, max_tokens, use_cache=False)[1])
+        elapsed = time.perf_counter() - start
+        return round(tokens / elapsed, 1) if elapsed > 0 else None
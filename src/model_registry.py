@@ -0,0 +1,38 @@
+import threading
+import time
+
+# Process-wide cache of loaded models, keyed by (model_path, n_ctx, n_threads)
+_models = {}
+_lock = threading.Lock()
+
+
+def get_model(model_path, n_ctx=2048, n_threads=4):
+    """Return a shared Llama instance, loading the weights on first use"""
+    key = (str(model_path), n_ctx, n_threads)
+    with _lock:
+        if key not in _models:
+            # Imported here so that processes which never run inference
+            # do not pay for loading llama_cpp
+            from llama_cpp import Llama
+
+            start = time.perf_counter()
+            _models[key] = Llama(
+                model_path=str(model_path),
+                n_ctx=n_ctx,
+                n_threads=n_threads,
+                verbose=False
+            )
+            print(f"Loaded model {model_path} in {time.perf_counter() - start:.1f}s")
+        return _models[key]
+
+
+def loaded_models():
+    """List the keys of all models currently held in memory"""
+    with _lock:
+        return list(_models.keys())
+
+
+def clear_models():
+    """Drop all cached models so their memory can be reclaimed"""
+    with _lock:
+        _models.clear()
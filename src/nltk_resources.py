@@ -0,0 +1,98 @@
+"""NLTK data used by ContentCollector: one-time install and offline startup check
+
+Install the resources once, on a machine with network access:
+
+    python -m src.nltk_resources
+
+Workers then only check the local directory at startup and never touch the
+network. The directory defaults to ./nltk_data and can be moved with the
+NLTK_DATA environment variable.
+"""
+import os
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+import nltk
+
+NLTK_DATA_DIR = Path(os.getenv('NLTK_DATA', 'nltk_data'))
+
+# NLTK 3.8.2 replaced the pickled punkt models with punkt_tab, and 3.9 the
+# pickled perceptron tagger with the JSON *_eng one. Only the variant the
+# installed release loads is of any use.
+PUNKT = 'punkt_tab' if hasattr(nltk.tokenize.punkt, 'PunktTokenizer') else 'punkt'
+TAGGER = (
+    'averaged_perceptron_tagger_eng'
+    if hasattr(nltk.tag.perceptron.PerceptronTagger, 'load_from_json')
+    else 'averaged_perceptron_tagger'
+)
+
+# Packages downloaded by the install step
+PACKAGES = [PUNKT, TAGGER, 'stopwords']
+
+# Resources checked at startup
+REQUIRED_RESOURCES = [f'tokenizers/{PUNKT}', f'taggers/{TAGGER}', 'corpora/stopwords']
+
+_verified = False
+_lock = threading.Lock()
+
+
+def ensure_resources():
+    """Check that the NLTK resources are available locally, without network access
+
+    Raises LookupError naming the missing resources. The check runs once per
+    process.
+    """
+    global _verified
+    with _lock:
+        if _verified:
+            return
+        if str(NLTK_DATA_DIR) not in nltk.data.path:
+            nltk.data.path.insert(0, str(NLTK_DATA_DIR))
+
+        missing = [resource for resource in REQUIRED_RESOURCES if not _exists(resource)]
+        if missing:
+            raise LookupError(
+                f"Missing NLTK resources: {', '.join(missing)}. "
+                f"Install them with: python -m src.nltk_resources"
+            )
+        _verified = True
+
+
+@lru_cache(maxsize=None)
+def english_stop_words():
+    """The English stop word list, loaded once per process"""
+    ensure_resources()
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+
+def install(download_dir=NLTK_DATA_DIR):
+    """Download every package into download_dir; returns the ones that failed"""
+    Path(download_dir).mkdir(parents=True, exist_ok=True)
+    failed = []
+    for package in PACKAGES:
+        if not nltk.download(package, download_dir=str(download_dir), quiet=True):
+            failed.append(package)
+    return failed
+
+
+def _exists(resource):
+    """Whether a resource is on the NLTK data path"""
+    try:
+        nltk.data.find(resource)
+        return True
+    except LookupError:
+        return False
+
+
+if __name__ == '__main__':
+    failed = install()
+    if failed:
+        print(f"Could not download: {', '.join(failed)}")
+    try:
+        ensure_resources()
+    except LookupError as e:
+        print(str(e))
+        sys.exit(1)
+    print(f"NLTK resources installed in {NLTK_DATA_DIR}")
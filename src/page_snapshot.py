@@ -0,0 +1,122 @@
+import threading
+from bs4 import BeautifulSoup
+from src.html_features import HtmlFeatures
+from src.fingerprints import fingerprint
+from src.http_cache import http_cache
+from src.tracing import span
+from src.http_client import USER_AGENT
+
+DEFAULT_HEADERS = {
+    'User-Agent': USER_AGENT
+}
+
+
+class PageSnapshot:
+    """A single fetch of a page, shared by every collector analyzing it
+
+    The page is downloaded on first access to `response`, parsed on first
+    access to `soup` and its main text extracted on first access to
+    `main_text`. Every access is counted so the report can show how many
+    downloads and parses sharing saved. A failed download is remembered and
+    re-raised to each caller rather than retried.
+    """
+
+    def __init__(self, url, headers=None, parser='html.parser'):
+        self.url = url
+        self.headers = headers or DEFAULT_HEADERS
+        # 'lxml' parses large pages several times faster when it is installed
+        self.parser = parser
+        self._response = None
+        self._error = None
+        self._soup = None
+        self._features = None
+        self._main_text = None
+        self._has_main_text = False
+        self._html_fingerprint = None
+        self._lock = threading.RLock()
+        self.fetches = 0
+        self.fetch_requests = 0
+        self.parses = 0
+        self.parse_requests = 0
+
+    @property
+    def response(self):
+        """The HTTP response for the page, downloaded once"""
+        with self._lock:
+            self.fetch_requests += 1
+            return self._fetch()
+
+    def _fetch(self):
+        """Download the page on first use and return the response"""
+        with self._lock:
+            if self._response is None and self._error is None:
+                self.fetches += 1
+                with span('fetch') as attributes:
+                    try:
+                        self._response = http_cache.get(self.url, headers=self.headers)
+                        attributes['status'] = self._response.status_code
+                        attributes['bytes'] = len(self._response.content)
+                        attributes['from_cache'] = getattr(self._response, 'from_cache', False)
+                    except Exception as e:
+                        self._error = e
+                        attributes['error'] = str(e)
+            if self._error is not None:
+                raise self._error
+            return self._response
+
+    @property
+    def html_fingerprint(self):
+        """SHA-256 of the downloaded HTML, computed once"""
+        with self._lock:
+            response = self._fetch()
+            if self._html_fingerprint is None:
+                self._html_fingerprint = fingerprint(response.content)
+            return self._html_fingerprint
+
+    @property
+    def soup(self):
+        """The parsed HTML tree, built once"""
+        with self._lock:
+            response = self._fetch()
+            self.parse_requests += 1
+            if self._soup is None:
+                self.parses += 1
+                with span('parse', parser=self.parser):
+                    self._soup = BeautifulSoup(response.text, self.parser)
+            return self._soup
+
+    @property
+    def features(self):
+        """Tags of the parsed page bucketed by name, collected in one traversal"""
+        soup = self.soup
+        with self._lock:
+            if self._features is None:
+                with span('features'):
+                    self._features = HtmlFeatures(soup)
+            return self._features
+
+    @property
+    def main_text(self):
+        """The main content of the page as extracted by trafilatura"""
+        with self._lock:
+            # trafilatura.fetch_url used to download the page separately
+            self.fetch_requests += 1
+            response = self._fetch()
+            if not self._has_main_text:
+                import trafilatura
+                with span('extract_main_text'):
+                    self._main_text = trafilatura.extract(response.text, include_links=True, include_images=True)
+                self._has_main_text = True
+            return self._main_text
+
+    def stats(self):
+        """How many downloads and parses were performed versus requested"""
+        with self._lock:
+            return {
+                'fetches': self.fetches,
+                'fetch_requests': self.fetch_requests,
+                'fetches_saved': self.fetch_requests - self.fetches,
+                'parses': self.parses,
+                'parse_requests': self.parse_requests,
+                'parses_saved': self.parse_requests - self.parses
+            }
@@ -0,0 +1,126 @@
+"""Readability statistics for many documents at once
+
+ContentCollector scores one page at a time; crawls and re-analyses of stored
+pages need the same numbers for thousands of texts. readability_batch()
+counts the syllables of every document in one NumPy pass over the
+concatenated text and evaluates the Flesch formula on whole arrays.
+
+Word and sentence counts come from each TextDocument's NLTK tokens, so the
+results are exactly those of the per-page analysis, and the tokens are still
+shared with the other content analyses.
+"""
+import numpy as np
+from src.text_document import TextDocument
+
+# Simplified Flesch Reading Ease: 206.835 - 1.015 * words/sentence - 84.6 * syllables/word
+FLESCH_BASE = 206.835
+FLESCH_SENTENCE_WEIGHT = 1.015
+FLESCH_SYLLABLE_WEIGHT = 84.6
+
+# Lowest Flesch score of each complexity level, from the easiest
+COMPLEXITY_LEVELS = [
+    (90, "Very Easy"),
+    (80, "Easy"),
+    (70, "Fairly Easy"),
+    (60, "Standard"),
+    (50, "Fairly Difficult"),
+    (30, "Difficult")
+]
+
+# A syllable is approximated as a maximal run of vowels
+VOWELS = 'aeiouy'
+
+_VOWEL_BYTES = np.zeros(256, dtype=bool)
+_VOWEL_BYTES[list(VOWELS.encode('ascii'))] = True
+
+
+def syllable_counts(texts):
+    """Number of vowel runs in each lower-cased text, its rough syllable count
+
+    The texts are joined with NUL separators and encoded once; a syllable
+    starts wherever a vowel byte follows a non-vowel byte. Multi-byte UTF-8
+    characters never contain ASCII vowel bytes, so they end runs just as the
+    regular expression does.
+    """
+    encoded = [text.lower().encode('utf-8') for text in texts]
+    if not encoded:
+        return np.zeros(0, dtype=np.int64)
+    data = np.frombuffer(b'\0'.join(encoded), dtype=np.uint8)
+    is_vowel = _VOWEL_BYTES[data]
+    starts = np.flatnonzero(is_vowel[1:] & ~is_vowel[:-1]) + 1
+    if is_vowel[:1].any():
+        starts = np.concatenate(([0], starts))
+    # Offset just past each document's separator
+    ends = np.cumsum([len(text) + 1 for text in encoded])
+    return np.bincount(np.searchsorted(ends, starts, side='right'), minlength=len(encoded))
+
+
+def readability_batch(documents):
+    """Counts, averages and unclamped Flesch scores of many documents as NumPy arrays
+
+    documents are TextDocuments or plain strings. Empty documents, including
+    pages without main text (None), are never tokenized and count as zero.
+    """
+    documents = [_document(document) for document in documents]
+    word_count = np.array(
+        [len(document.words) if document.text else 0 for document in documents], dtype=np.int64
+    )
+    sentence_count = np.array(
+        [len(document.sentences) if document.text else 0 for document in documents], dtype=np.int64
+    )
+    syllable_count = syllable_counts([document.text or '' for document in documents])
+
+    avg_sentence_length = np.divide(
+        word_count, sentence_count, out=np.zeros(len(documents)), where=sentence_count > 0
+    )
+    avg_syllables_per_word = np.divide(
+        syllable_count, word_count, out=np.zeros(len(documents)), where=word_count > 0
+    )
+    flesch_score = (
+        FLESCH_BASE
+        - (FLESCH_SENTENCE_WEIGHT * avg_sentence_length)
+        - (FLESCH_SYLLABLE_WEIGHT * avg_syllables_per_word)
+    )
+    return {
+        'word_count': word_count,
+        'sentence_count': sentence_count,
+        'syllable_count': syllable_count,
+        'avg_sentence_length': avg_sentence_length,
+        'avg_syllables_per_word': avg_syllables_per_word,
+        'flesch_score': flesch_score
+    }
+
+
+def readability_reports(documents):
+    """The readability section of ContentCollector for each document, computed as one batch"""
+    documents = [_document(document) for document in documents]
+    stats = readability_batch(documents)
+    reports = []
+    for i, document in enumerate(documents):
+        if not document.text:
+            reports.append({})
+            continue
+        flesch_score = float(stats['flesch_score'][i])
+        reports.append({
+            'flesch_reading_ease': min(100, max(0, flesch_score)),  # Clamp between 0 and 100
+            # Plain 0 rather than 0.0 when there is nothing to divide, as before
+            'avg_sentence_length': float(stats['avg_sentence_length'][i]) if stats['sentence_count'][i] > 0 else 0,
+            'avg_syllables_per_word': float(stats['avg_syllables_per_word'][i]) if stats['word_count'][i] > 0 else 0,
+            'complexity_level': complexity_level(flesch_score)
+        })
+    return reports
+
+
+def complexity_level(flesch_score):
+    """Convert Flesch score to complexity level"""
+    for minimum, level in COMPLEXITY_LEVELS:
+        if flesch_score >= minimum:
+            return level
+    return "Very Difficult"
+
+
+def _document(document):
+    # Readability never looks at stop words
+    if document is None or isinstance(document, str):
+        return TextDocument(document, frozenset())
+    return document
@@ -0,0 +1,29 @@
+import json
+import sys
+import threading
+
+
+class NdjsonEventWriter:
+    """Write report events as newline-delimited JSON, one flushed line per event
+
+    Events from concurrent collectors and reports are serialized under a lock
+    so lines never interleave. Pass '-' to write to standard output.
+    """
+
+    def __init__(self, target):
+        self._owns_stream = target != '-'
+        self._stream = open(target, 'a', encoding='utf-8') if self._owns_stream else sys.stdout
+        self._lock = threading.Lock()
+        self.events = 0
+
+    def __call__(self, event):
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            self._stream.write(line + '\n')
+            self._stream.flush()
+            self.events += 1
+
+    def close(self):
+        with self._lock:
+            if self._owns_stream:
+                self._stream.close()
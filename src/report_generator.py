@@ -1,63 +1,414 @@
-from src.collectors.content_collector import ContentCollector
-from src.collectors.google_collector import GoogleCollector
-from src.collectors.performance_collector import PerformanceCollector
-from src.collectors.seo_collector import SEOCollector
-from src.collectors.technical_collector import TechnicalCollector
+from src.collector_registry import create_collector, default_collector_names, validate_names
+from src.fingerprints import HTML_SECTIONS, previous_fingerprints
+from src.http_cache import http_cache
+from src.http_client import http_client
+from src.llm_batch import CompletionBatch
+from src.page_snapshot import PageSnapshot
+from src.report_store import ReportStore
+from src.seo_scoring import is_scored_with, resolve_weights
+from src.tracing import Trace, bind, span, stage_summary, write_prometheus
 import json
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
 from datetime import datetime
 from pathlib import Path
-import nltk
+from urllib.parse import urlparse
+
+# Collectors that analyze the page HTML and accept a shared PageSnapshot
+PAGE_COLLECTORS = {'seo', 'content', 'technical'}
 
 class ReportGenerator:
-    def __init__(self):
-        self.collectors = {
-            'seo': SEOCollector(),
-            #'content': ContentCollector(),
-            #'performance': PerformanceCollector(),
-            #'technical': TechnicalCollector()
-        }
-        
-        # Only initialize Google collector if credentials exist
-        credentials_path = Path("credentials/google-credentials.json")
-        if credentials_path.exists():
-            self.collectors['google'] = GoogleCollector()
-
-    def generate_report(self, url, google_property_id=None):
-        """Generate a comprehensive report using all collectors"""
+    def __init__(self, collector_names=None, llm=True, score_weights=None, keyword_index=None):
+        """llm=False skips the SEO conclusion so no model is ever loaded;
+        score_weights overrides seo_scoring.DEFAULT_WEIGHTS for the overall SEO score;
+        keyword_index, a KeywordIndex, receives the content words of every analyzed page"""
+        if collector_names is None:
+            collector_names = default_collector_names()
+        validate_names(collector_names)
+        self.collector_names = list(collector_names)
+        self.llm = llm
+        self.score_weights = resolve_weights(score_weights) if score_weights else None
+        self.keyword_index = keyword_index
+        self.collectors = self._create_collectors()
+        # Collectors keep per-page state, so batch workers each get their own
+        self._local = threading.local()
+        # Open report stores by output directory
+        self._stores = {}
+        self._stores_lock = threading.Lock()
+
+    def _create_collectors(self):
+        """Instantiate the enabled collectors, importing only their modules"""
+        return {name: self._create_collector(name) for name in self.collector_names}
+
+    def _create_collector(self, name):
+        """Instantiate one collector configured with the generator's settings"""
+        collector = create_collector(name)
+        if name == 'seo':
+            collector.weights = self.score_weights
+        elif name == 'content':
+            collector.keyword_index = self.keyword_index
+        return collector
+
+    def generate_report(self, url, google_property_id=None, collectors=None, collector_timeout=None,
+                        reuse_unchanged=True, on_event=None):
+        """Generate a comprehensive report using all collectors
+
+        Collectors run concurrently. A collector that raises, or that is still
+        running after collector_timeout seconds, is recorded as None without
+        holding up the others. A timed-out collector is replaced in collectors
+        by a fresh instance, so the next page never shares its state.
+
+        With reuse_unchanged, the page is compared with the last stored report
+        for the URL: if the HTML is identical the SEO and content sections are
+        copied from it without parsing the page, and if only the extracted
+        features and scores match, the SEO conclusion is reused instead of
+        prompting the model. Reused sections are listed under 'reuse'.
+
+        Timed spans of every stage (fetch, parse, features, each collector,
+        scoring, LLM calls) are attached under 'trace'.
+
+        on_event, if given, receives each part of the report as soon as it is
+        ready, as a dict with 'event', 'url' and 'elapsed' seconds: 'start';
+        'section' for each SEO analysis, the scores and every LLM answer;
+        'collector' when a collector's whole section is done; and 'end'. The
+        returned report has the same layout whether or not events are used.
+        """
+        start = time.perf_counter()
+
+        def emit(event, **fields):
+            if on_event is not None:
+                on_event({'event': event, 'url': url, 'elapsed': round(time.perf_counter() - start, 3), **fields})
+
+        trace = Trace()
+        with trace.activate():
+            report = self._collect_report(url, google_property_id, collectors, collector_timeout, reuse_unchanged, emit)
+        report['trace'] = trace.to_dict()
+        emit('end', timestamp=report['timestamp'], collector_timings=report['collector_timings'])
+        return report
+
+    def _collect_report(self, url, google_property_id, collectors, collector_timeout, reuse_unchanged, emit):
+        """Run the collectors for one URL; the body of generate_report"""
+        if collectors is None:
+            collectors = self.collectors
+
         report = {
             'url': url,
             'timestamp': datetime.now().isoformat(),
-            'data': {}
+            'data': {},
+            'collector_timings': {}
         }
+        emit('start', timestamp=report['timestamp'], collectors=list(collectors))
 
-        # Collect data from each collector
-        for collector_name, collector in self.collectors.items():
+        # Fetch and parse the page once for every collector that needs the HTML
+        snapshot = PageSnapshot(url)
+
+        # A crawl report for the same URL holds no page sections to reuse
+        previous = self.report_store().latest(url, kind='page') if reuse_unchanged else None
+        previous_data = (previous or {}).get('data') or {}
+        try:
+            html_fingerprint = snapshot.html_fingerprint
+        except Exception:
+            html_fingerprint = None
+        report['fingerprints'] = {'html': html_fingerprint}
+        previous_timings = (previous or {}).get('collector_timings') or {}
+        reused = {}
+        if html_fingerprint is not None and previous_fingerprints(previous).get('html') == html_fingerprint:
+            # Only sections whose previous collection succeeded; a failed run
+            # would otherwise stand in for the page until its HTML changes
+            for collector_name in HTML_SECTIONS:
+                if (
+                    collector_name in collectors
+                    and previous_data.get(collector_name) is not None
+                    and previous_timings.get(collector_name, {}).get('ok', True)
+                    # Failed content runs used to be stored as a fallback dict
+                    and (collector_name != 'content' or 'main_content' in previous_data['content'])
+                ):
+                    reused[collector_name] = 'html'
+            # Scores of the stored section must also follow the current rules and
+            # weights, and a section stored by a --no-llm run has no conclusion to reuse
+            if 'seo' in reused and (
+                not is_scored_with(previous_data['seo'], self.score_weights)
+                or (self.llm and not previous_data['seo'].get('conclusion'))
+            ):
+                del reused['seo']
+
+        # Collectors that timed out keep running in the background; whatever
+        # they emit afterwards belongs to no report and is dropped
+        timed_out = set()
+        events_lock = threading.Lock()
+
+        def collector_emit(collector_name, event, **fields):
+            with events_lock:
+                if collector_name not in timed_out:
+                    emit(event, collector=collector_name, **fields)
+
+        def collect(collector_name, collector):
+            timing = {'started': datetime.now().isoformat()}
+            start = time.perf_counter()
             try:
                 print(f"Collecting {collector_name} data...")
-                if collector_name == 'google' and google_property_id:
-                    data = collector.collect_data(url, google_property_id)
-                else:
-                    data = collector.collect_data(url)
-                report['data'][collector_name] = data
+                with span(f'collector.{collector_name}'):
+                    if collector_name == 'google' and google_property_id:
+                        data = collector.collect_data(url, google_property_id)
+                    elif collector_name == 'seo':
+                        data = collector.collect_data(
+                            url, snapshot=snapshot, conclusion=self.llm, previous=previous_data.get('seo'),
+                            on_section=lambda section, value: collector_emit('seo', 'section', section=section, data=value)
+                        )
+                    elif collector_name in PAGE_COLLECTORS:
+                        data = collector.collect_data(url, snapshot=snapshot)
+                    else:
+                        data = collector.collect_data(url)
+                timing['ok'] = True
             except Exception as e:
                 print(f"Error collecting {collector_name} data: {str(e)}")
-                report['data'][collector_name] = None
+                data = None
+                timing['ok'] = False
+            timing['finished'] = datetime.now().isoformat()
+            timing['seconds'] = round(time.perf_counter() - start, 3)
+            collector_emit(collector_name, 'collector', data=data, timing=timing)
+            return data, timing
+
+        # Collect data from each collector
+        pool = ThreadPoolExecutor(max_workers=max(1, len(collectors)))
+        futures = {
+            collector_name: pool.submit(bind(collect), collector_name, collector)
+            for collector_name, collector in collectors.items()
+            if collector_name not in reused
+        }
+        for collector_name in reused:
+            print(f"Reusing {collector_name} data: page unchanged since {previous['timestamp']}")
+            report['data'][collector_name] = previous_data[collector_name]
+            report['collector_timings'][collector_name] = {'ok': True, 'reused': True, 'seconds': 0}
+            emit('collector', collector=collector_name, data=report['data'][collector_name],
+                 timing=report['collector_timings'][collector_name])
+        if 'content' in reused and self.keyword_index is not None and url not in self.keyword_index:
+            self._index_keywords(url, previous_data['content'].get('main_content'), collectors['content'])
+        deadline = time.perf_counter() + collector_timeout if collector_timeout else None
+        for collector_name, future in futures.items():
+            try:
+                timeout = max(0, deadline - time.perf_counter()) if deadline else None
+                data, timing = future.result(timeout=timeout)
+            except FutureTimeoutError:
+                print(f"Timed out collecting {collector_name} data")
+                data, timing = None, {'ok': False, 'timed_out': True}
+                with events_lock:
+                    timed_out.add(collector_name)
+                    emit('collector', collector=collector_name, data=None, timing=timing)
+                # The timed-out instance is still working on this page and keeps
+                # per-page state on itself, so later pages get a fresh one
+                collectors[collector_name] = self._create_collector(collector_name)
+            report['data'][collector_name] = data
+            report['collector_timings'][collector_name] = timing
+        # Don't wait for timed-out collectors; their threads finish in the background
+        pool.shutdown(wait=False)
+
+        # Keep the report's section order independent of which ones were reused
+        report['data'] = {name: report['data'][name] for name in collectors}
+        report['collector_timings'] = {name: report['collector_timings'][name] for name in collectors}
+
+        seo_data = report['data'].get('seo')
+        if seo_data:
+            report['fingerprints'].update(seo_data.get('fingerprints', {}))
+            if 'seo' not in reused and 'conclusion' in seo_data.get('reused', []):
+                reused['seo.conclusion'] = 'features_and_scores'
+        if previous is not None:
+            report['reuse'] = {
+                'previous_timestamp': previous['timestamp'],
+                'sections': reused
+            }
+
+        report['page_snapshot'] = snapshot.stats()
+        report['http_cache'] = http_cache.stats()
+        report['http_client'] = http_client.stats()
 
         return report
 
+    def _index_keywords(self, url, text, content_collector):
+        """Add a page whose content section was reused to the keyword index"""
+        if not text:
+            return
+        from src.text_document import TextDocument
+        self.keyword_index.add_page(url, TextDocument(text, content_collector.stop_words).content_words)
+
+    def generate_reports(self, urls, google_property_id=None, max_workers=4, per_host=2,
+                         measure_sequential=False, collector_timeout=None, reuse_unchanged=True,
+                         on_event=None):
+        """Generate reports for many sites concurrently, running all LLM prompts as one batch
+
+        At most max_workers reports are generated at once, and at most per_host
+        of them against the same host; both must be at least 1. A URL is only
+        submitted once its host has a free slot, so no worker sits idle waiting
+        on a busy host. Returns the reports in input order and a summary with
+        per-URL wall time and overall throughput.
+
+        Events are emitted as for generate_report. Batched SEO conclusions are
+        only answered once every page is collected, so their 'section' events
+        follow the reports' 'end' events, and a final 'batch_end' event closes
+        the stream.
+        """
+        if max_workers < 1 or per_host < 1:
+            raise ValueError(f"max_workers and per_host must be at least 1, got {max_workers} and {per_host}")
+        seo_collector = self.collectors.get('seo')
+        if seo_collector is not None and self.llm:
+            from src.collectors.seo_collector import MODEL_PATH, COMPLETION_PARAMS
+            batch = CompletionBatch(MODEL_PATH, COMPLETION_PARAMS, cache=seo_collector.completion_cache)
+        else:
+            batch = None
+
+        def run(url):
+            start = time.perf_counter()
+            try:
+                report = self.generate_report(
+                    url, google_property_id,
+                    collectors=self._worker_collectors(batch),
+                    collector_timeout=collector_timeout,
+                    reuse_unchanged=reuse_unchanged,
+                    on_event=on_event
+                )
+            except Exception as e:
+                print(f"Error generating report for {url}: {str(e)}")
+                report = None
+            return report, time.perf_counter() - start
+
+        # Host -> indices of its URLs not submitted yet, in input order
+        pending = {}
+        for i, url in enumerate(urls):
+            pending.setdefault(urlparse(url).netloc, deque()).append(i)
+        active = Counter()
+        results = [None] * len(urls)
+
+        started = datetime.now()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # Future -> (index, host) of every report being generated
+            in_flight = {}
+            while pending or in_flight:
+                for host in list(pending):
+                    queue = pending[host]
+                    while queue and active[host] < per_host and len(in_flight) < max_workers:
+                        i = queue.popleft()
+                        active[host] += 1
+                        in_flight[pool.submit(run, urls[i])] = (i, host)
+                    if not queue:
+                        del pending[host]
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, host = in_flight.pop(future)
+                    active[host] -= 1
+                    results[i] = future.result()
+
+        stats = None
+        batch_trace = Trace()
+        if batch is not None and len(batch):
+            print(f"Running {len(batch)} queued LLM conclusions...")
+            with batch_trace.activate():
+                stats = batch.run(measure_sequential=measure_sequential)
+            for report, _ in results:
+                if report is not None:
+                    report['llm_batch'] = stats
+        elapsed = time.perf_counter() - start
+
+        summary = {
+            'timestamp': started.isoformat(),
+            'url_count': len(urls),
+            'max_workers': max_workers,
+            'per_host': per_host,
+            'wall_seconds': round(elapsed, 3),
+            'pages_per_minute': round(len(urls) / elapsed * 60, 2) if elapsed > 0 else None,
+            'results': [
+                {
+                    'url': url,
+                    'ok': report is not None,
+                    'wall_seconds': round(seconds, 3)
+                }
+                for url, (report, seconds) in zip(urls, results)
+            ],
+            'llm_batch': stats,
+            # Batched LLM completions are shared between reports, so their
+            # spans are kept here rather than in any one report
+            'trace': batch_trace.to_dict(),
+            'stages': stage_summary(
+                [report['trace'] for report, _ in results if report is not None] + [batch_trace.to_dict()]
+            ),
+            'http_cache': http_cache.stats(),
+            'http_client': http_client.stats()
+        }
+        if self.keyword_index is not None:
+            summary['keyword_index'] = self.keyword_index.stats()
+
+        if on_event is not None:
+            on_event({'event': 'batch_end', 'url_count': len(urls), 'wall_seconds': summary['wall_seconds']})
+
+        return [report for report, _ in results], summary
+
+    def crawl_site(self, url, max_depth=3, max_pages=500, max_workers=8):
+        """Crawl a site's internal links and build a site-level SEO report"""
+        from src.crawler import SiteCrawler
+
+        crawler = SiteCrawler(
+            max_depth=max_depth, max_pages=max_pages, max_workers=max_workers,
+            llm=self.llm, score_weights=self.score_weights
+        )
+        return crawler.crawl(url)
+
+    def _worker_collectors(self, batch):
+        """Collectors for the current worker thread, wired to the shared LLM batch"""
+        collectors = getattr(self._local, 'collectors', None)
+        if collectors is None:
+            collectors = self._local.collectors = self._create_collectors()
+
+        seo_collector = collectors.get('seo')
+        if seo_collector is not None and batch is not None:
+            seo_collector.llm_batch = batch
+            if batch.cache is not None:
+                seo_collector.completion_cache = batch.cache
+        return collectors
+
     def save_report(self, report, output_dir='reports'):
-        """Save the report to a JSON file"""
-        # Create reports directory if it doesn't exist
+        """Append the report to the report store in output_dir and return its location
+
+        Use `python -m src.report_store export` to get one JSON file per report.
+        """
+        store = self.report_store(output_dir)
+        start = time.perf_counter()
+        report_id = store.append(report)
+        # The stored copy cannot contain its own save time; it is added to the
+        # in-memory report so write_metrics() sees it
+        if 'trace' in report:
+            report['trace']['spans'].append({'name': 'save', 'seconds': round(time.perf_counter() - start, 4)})
+        return f"{store.path}#{report_id}"
+
+    def report_store(self, output_dir='reports'):
+        """The report store kept in output_dir, opened on first use"""
+        with self._stores_lock:
+            if output_dir not in self._stores:
+                self._stores[output_dir] = ReportStore(Path(output_dir) / 'reports.sqlite')
+            return self._stores[output_dir]
+
+    def write_metrics(self, reports, output_dir='reports', summary=None):
+        """Write stage latencies and LLM token counts of reports to metrics.prom
+
+        The file uses the Prometheus text exposition format. If a batch summary
+        is given, its shared LLM spans are included and its per-stage p50/p95
+        are refreshed to cover report saves as well.
+        """
+        traces = [report['trace'] for report in reports if report is not None and 'trace' in report]
+        if summary is not None and summary.get('trace'):
+            traces.append(summary['trace'])
+            summary['stages'] = stage_summary(traces)
+        return write_prometheus(traces, Path(output_dir) / 'metrics.prom')
+
+    def save_summary(self, summary, output_dir='reports'):
+        """Save a batch summary to a JSON file"""
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-        # Generate filename based on URL and timestamp
-        url_slug = report['url'].replace('https://', '').replace('http://', '').replace('/', '_')
-        timestamp = datetime.fromisoformat(report['timestamp']).strftime('%Y%m%d_%H%M%S')
-        filename = f"{url_slug}_{timestamp}.json"
-        filepath = Path(output_dir) / filename
+        timestamp = datetime.fromisoformat(summary['timestamp']).strftime('%Y%m%d_%H%M%S')
+        filepath = Path(output_dir) / f"batch_summary_{timestamp}.json"
 
-        # Save report with pretty printing
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+            json.dump(summary, f, indent=2, ensure_ascii=False)
 
-        return filepath 
\ No newline at end of file
+        return filepath
@@ -0,0 +1,197 @@
+"""Append-only, compressed store of generated reports
+
+Every report is one row of a SQLite database: the URL and timestamp are
+indexed and the report itself is stored as zlib-compressed compact JSON.
+Rows are never updated or deleted.
+
+Export reports to the one-JSON-file-per-report layout used before the store:
+
+    python -m src.report_store export OUTPUT_DIR [--store reports/reports.sqlite] [--url URL]
+
+Import existing JSON reports into the store:
+
+    python -m src.report_store import DIRECTORY [--store reports/reports.sqlite]
+"""
+import argparse
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_STORE_PATH = Path("reports/reports.sqlite")
+COMPRESSION_LEVEL = 6
+
+
+class ReportStore:
+    """SQLite-backed append-only report store indexed by URL and timestamp"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL lets readers run while a batch is appending
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS reports (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            body BLOB NOT NULL
+        )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS reports_url_timestamp ON reports (url, timestamp)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS reports_timestamp ON reports (timestamp)")
+        self._db.commit()
+
+    def append(self, report):
+        """Store a report and return its id"""
+        return self.append_many([report])[0]
+
+    def append_many(self, reports):
+        """Store several reports in one transaction and return their ids"""
+        rows = [self._row(report) for report in reports]
+        ids = []
+        with self._lock:
+            with self._db:
+                for row in rows:
+                    cursor = self._db.execute(
+                        "INSERT INTO reports (url, timestamp, kind, size, body) VALUES (?, ?, ?, ?, ?)", row
+                    )
+                    ids.append(cursor.lastrowid)
+        return ids
+
+    def get(self, report_id):
+        """The report with this id, or None"""
+        with self._lock:
+            row = self._db.execute("SELECT body FROM reports WHERE id = ?", (report_id,)).fetchone()
+        return _decode(row[0]) if row else None
+
+    def latest(self, url, kind=None):
+        """The most recent report for a URL, optionally only of one kind ('page' or 'crawl'), or None"""
+        query = "SELECT body FROM reports WHERE url = ?"
+        params = [url]
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " ORDER BY timestamp DESC, id DESC LIMIT 1"
+        with self._lock:
+            row = self._db.execute(query, params).fetchone()
+        return _decode(row[0]) if row else None
+
+    def history(self, url):
+        """(id, timestamp, kind) of every report for a URL, newest first, without decoding them"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, timestamp, kind FROM reports WHERE url = ? ORDER BY timestamp DESC, id DESC", (url,)
+            ).fetchall()
+
+    def urls(self):
+        """Every URL with at least one report"""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT DISTINCT url FROM reports ORDER BY url")]
+
+    def iter_reports(self, url=None, since=None):
+        """Yield reports oldest first, optionally for one URL or from an ISO timestamp on
+
+        Rows are fetched in pages so the whole store is never held in memory.
+        """
+        query = "SELECT id, body FROM reports WHERE id > ?"
+        params = []
+        if url is not None:
+            query += " AND url = ?"
+            params.append(url)
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        query += " ORDER BY id LIMIT 100"
+
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute(query, [last_id] + params).fetchall()
+            if not rows:
+                return
+            for report_id, body in rows:
+                yield _decode(body)
+            last_id = rows[-1][0]
+
+    def export(self, output_dir, url=None):
+        """Write reports as indented JSON files named like the old save_report did; returns the paths"""
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        paths = []
+        for report in self.iter_reports(url=url):
+            filepath = Path(output_dir) / report_filename(report)
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            paths.append(filepath)
+        return paths
+
+    def import_directory(self, directory):
+        """Append every *.json report in a directory, skipping batch summaries; returns the count"""
+        reports = []
+        for filepath in sorted(Path(directory).glob('*.json')):
+            with open(filepath, encoding='utf-8') as f:
+                report = json.load(f)
+            if isinstance(report, dict) and 'url' in report and 'timestamp' in report:
+                reports.append(report)
+        self.append_many(reports)
+        return len(reports)
+
+    def stats(self):
+        """Report count, raw JSON size and stored (compressed) size"""
+        with self._lock:
+            count, raw, stored = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM reports"
+            ).fetchone()
+        return {
+            'reports': count,
+            'json_bytes': raw,
+            'stored_bytes': stored,
+            'compression_ratio': round(raw / stored, 2) if stored else None
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _row(self, report):
+        data = json.dumps(report, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        kind = 'crawl' if 'crawl' in report else 'page'
+        return report['url'], report['timestamp'], kind, len(data), zlib.compress(data, COMPRESSION_LEVEL)
+
+
+def report_filename(report):
+    """File name the per-run JSON layout uses for a report"""
+    url_slug = report['url'].replace('https://', '').replace('http://', '').replace('/', '_')
+    timestamp = datetime.fromisoformat(report['timestamp']).strftime('%Y%m%d_%H%M%S')
+    return f"{url_slug}_{timestamp}.json"
+
+
+def _decode(body):
+    return json.loads(zlib.decompress(body).decode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export or import reports of the report store')
+    parser.add_argument('command', choices=['export', 'import'])
+    parser.add_argument('directory', help='Directory to write JSON reports to, or to read them from')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH), help='Path of the report store')
+    parser.add_argument('--url', help='Only export reports for this URL')
+    args = parser.parse_args()
+
+    store = ReportStore(args.store)
+    if args.command == 'export':
+        paths = store.export(args.directory, url=args.url)
+        print(f"Exported {len(paths)} reports to {args.directory}")
+    else:
+        count = store.import_directory(args.directory)
+        print(f"Imported {count} reports into {store.path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+"""Rule-based SEO scoring of many pages at once, without any model
+
+The analyses SEOCollector extracts for a page (meta tags, headings, links,
+images, mobile viewport) are reduced to one row of numeric features. A table
+of rows, one NumPy column per feature, is scored in a handful of vectorized
+operations, so changing a rule or the weights and re-scoring the whole report
+history takes seconds:
+
+    python -m src.seo_scoring [--store reports/reports.sqlite] [--url URL]
+                              [--weights meta_tags=0.3,images=0.1] [--output rescored.json]
+
+The scores are exactly those SEOCollector computes for a single page, which
+uses score_breakdown() below.
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+# Weight of each sub-score in the overall score
+DEFAULT_WEIGHTS = {
+    'meta_tags': 0.25,
+    'headings': 0.20,
+    'links': 0.20,
+    'images': 0.15,
+    'mobile': 0.20
+}
+
+# Points for each meta tag that is present (max 100)
+META_POINTS = {
+    'has_title': 20,
+    'has_description': 20,
+    'has_keywords': 15,
+    'has_robots': 15,
+    'has_viewport_meta': 15,
+    'has_charset': 15
+}
+
+FEATURE_COLUMNS = list(META_POINTS) + [
+    'h1_count',
+    'h2_count',
+    'h1_max_length',
+    'heading_count',
+    'internal_links',
+    'external_links',
+    'images',
+    'images_with_alt',
+    'has_viewport',
+    'device_width',
+    'initial_scale'
+]
+
+
+def page_features(seo_data):
+    """Reduce the analyses of one page (the SEO section of a report) to a feature row"""
+    meta = seo_data.get('meta_tags') or {}
+    headings = seo_data.get('headings') or {}
+    links = seo_data.get('links') or {}
+    images = seo_data.get('images') or {}
+    mobile = seo_data.get('mobile_friendly') or {}
+    viewport_content = mobile.get('viewport_content') or ''
+
+    return {
+        'has_title': bool(meta.get('title')),
+        'has_description': bool(meta.get('meta_description')),
+        'has_keywords': bool(meta.get('meta_keywords')),
+        'has_robots': bool(meta.get('robots')),
+        'has_viewport_meta': bool(meta.get('viewport')),
+        'has_charset': bool(meta.get('charset')),
+        'h1_count': headings.get('h1', {}).get('count', 0),
+        'h2_count': headings.get('h2', {}).get('count', 0),
+        'h1_max_length': max((len(content) for content in headings.get('h1', {}).get('content', [])), default=0),
+        'heading_count': sum(h.get('count', 0) for h in headings.values()),
+        'internal_links': links.get('internal', {}).get('count', 0),
+        'external_links': links.get('external', {}).get('count', 0),
+        'images': images.get('total_count', 0),
+        'images_with_alt': images.get('with_alt', 0),
+        'has_viewport': bool(mobile.get('has_viewport')),
+        'device_width': 'width=device-width' in viewport_content,
+        'initial_scale': 'initial-scale=1' in viewport_content
+    }
+
+
+def feature_table(rows):
+    """Column name -> NumPy array for a list of feature rows"""
+    # Imported on first use so the CLI starts without NumPy
+    import numpy as np
+    return {
+        column: np.array([row[column] for row in rows], dtype=np.int64)
+        for column in FEATURE_COLUMNS
+    }
+
+
+def resolve_weights(weights=None):
+    """The default weights updated with weights; raises ValueError for unknown sub-scores
+    or weights that are negative or do not sum to 1
+    """
+    resolved = dict(DEFAULT_WEIGHTS)
+    if weights:
+        unknown = sorted(set(weights) - set(DEFAULT_WEIGHTS))
+        if unknown:
+            raise ValueError(f"Unknown score weight(s): {', '.join(unknown)} (expected {', '.join(DEFAULT_WEIGHTS)})")
+        resolved.update({key: float(value) for key, value in weights.items()})
+        if min(resolved.values()) < 0 or abs(sum(resolved.values()) - 1) > 1e-6:
+            raise ValueError(
+                f"Score weights must be non-negative and sum to 1, got "
+                f"{', '.join(f'{key}={value:g}' for key, value in resolved.items())}"
+            )
+    return resolved
+
+
+def parse_weights(text):
+    """Parse 'meta_tags=0.3,images=0.1' into a weights dict"""
+    weights = {}
+    for item in text.split(','):
+        if not item.strip():
+            continue
+        key, separator, value = item.partition('=')
+        try:
+            if not separator:
+                raise ValueError
+            weights[key.strip()] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid score weight '{item.strip()}', expected name=number") from None
+    return resolve_weights(weights)
+
+
+def score_table(table, weights=None):
+    """Sub-scores and the weighted overall score for every row of a feature table
+
+    Returns sub-score name -> int array, with 'overall' last.
+    """
+    import numpy as np
+    weights = resolve_weights(weights)
+
+    meta_tags = sum(points * table[column] for column, points in META_POINTS.items())
+    headings = (
+        40 * (table['h1_count'] == 1)
+        + 20 * (table['h2_count'] > 0)
+        + 20 * (table['h1_max_length'] < 70)
+        + 20 * (table['heading_count'] < 15)
+    )
+    links = (
+        40 * (table['internal_links'] > 0)
+        + 30 * (table['external_links'] > 0)
+        + 30 * (table['internal_links'] > table['external_links'])
+    )
+    total_images = table['images']
+    alt_ratio = table['images_with_alt'] / np.maximum(total_images, 1)
+    images = np.where(total_images > 0, (alt_ratio * 100).astype(np.int64), 0)
+    mobile = 50 * table['has_viewport'] + 25 * table['device_width'] + 25 * table['initial_scale']
+
+    scores = {
+        'meta_tags': meta_tags.astype(np.int64),
+        'headings': headings.astype(np.int64),
+        'links': links.astype(np.int64),
+        'images': images,
+        'mobile': mobile.astype(np.int64)
+    }
+    # Accumulated in the order of the weights so results match summing them one page at a time
+    overall = np.zeros(len(total_images))
+    for key, weight in weights.items():
+        overall += scores[key] * weight
+    scores['overall'] = np.rint(overall).astype(np.int64)
+    return scores
+
+
+def score_pages(seo_sections, weights=None):
+    """Score the SEO sections of many reports at once"""
+    return score_table(feature_table([page_features(seo_data) for seo_data in seo_sections]), weights)
+
+
+def score_breakdown(features, weights=None):
+    """Scores of one page with their formula explanations, as stored under data.seo.score"""
+    weights = resolve_weights(weights)
+    values = {key: int(column[0]) for key, column in score_table(feature_table([features]), weights).items()}
+
+    meta_lines = '\n'.join(
+        f"- {label}: {points if features[column] else 0}/{points} points"
+        for (column, points), label in zip(
+            META_POINTS.items(),
+            ['Title', 'Meta description', 'Meta keywords', 'Robots tag', 'Viewport tag', 'Charset']
+        )
+    )
+    descriptions = {
+        'meta_tags': f"Score breakdown (max 100):\n{meta_lines}",
+        'headings': f"""Score breakdown (max 100):
+- Single H1 tag: {40 if features['h1_count'] == 1 else 0}/40 points
+- H2 tags present: {20 if features['h2_count'] > 0 else 0}/20 points
+- H1 length < 70 chars: {20 if features['h1_max_length'] < 70 else 0}/20 points
+- Total headings < 15: {20 if features['heading_count'] < 15 else 0}/20 points""",
+        'links': f"""Score breakdown (max 100):
+- Has internal links: {40 if features['internal_links'] > 0 else 0}/40 points
+- Has external links: {30 if features['external_links'] > 0 else 0}/30 points
+- More internal than external: {30 if features['internal_links'] > features['external_links'] else 0}/30 points""",
+        'images': f"""Score breakdown (max 100):
+- Alt text coverage: {values['images']}/100 points
+  ({features['images_with_alt']} of {features['images']} images have alt text)""",
+        'mobile': f"""Score breakdown (max 100):
+- Viewport meta tag: {50 if features['has_viewport'] else 0}/50 points
+- width=device-width: {25 if features['device_width'] else 0}/25 points
+- initial-scale=1: {25 if features['initial_scale'] else 0}/25 points"""
+    }
+    labels = {'meta_tags': 'Meta tags', 'headings': 'Headings', 'links': 'Links', 'images': 'Images', 'mobile': 'Mobile'}
+    descriptions['overall'] = "Score breakdown (weighted average):\n" + '\n'.join(
+        f"- {labels[key]}: {values[key]} × {weight * 100:g}% = {values[key] * weight:.1f}"
+        for key, weight in weights.items()
+    )
+
+    return {key: {'value': values[key], 'description': descriptions[key]} for key in values}
+
+
+def is_scored_with(seo_data, weights=None):
+    """Whether a stored SEO section's scores are what the current rules and weights give"""
+    try:
+        return score_breakdown(page_features(seo_data), weights) == seo_data.get('score')
+    except Exception:
+        return False
+
+
+def main():
+    from src.report_store import DEFAULT_STORE_PATH, ReportStore
+
+    parser = argparse.ArgumentParser(description='Re-score the SEO sections of stored reports without the LLM')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH), help='Path of the report store')
+    parser.add_argument('--url', help='Only re-score reports for this URL')
+    parser.add_argument('--weights', help='Overall score weights, e.g. meta_tags=0.3,images=0.1')
+    parser.add_argument('--output', help='Write the new scores of every report to this JSON file')
+    args = parser.parse_args()
+    try:
+        weights = parse_weights(args.weights) if args.weights else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    store = ReportStore(args.store)
+    keys, sections = [], []
+    for report in store.iter_reports(url=args.url):
+        seo_data = (report.get('data') or {}).get('seo')
+        if seo_data:
+            keys.append((report['url'], report['timestamp'], seo_data.get('score', {}).get('overall', {}).get('value')))
+            sections.append(seo_data)
+
+    start = time.perf_counter()
+    scores = score_pages(sections, weights)
+    elapsed = time.perf_counter() - start
+
+    changed = sum(1 for (_, _, previous), overall in zip(keys, scores['overall']) if previous != overall)
+    print(f"Re-scored {len(sections)} reports in {elapsed:.3f}s; {changed} overall scores changed")
+
+    if args.output:
+        rows = [
+            {
+                'url': url,
+                'timestamp': timestamp,
+                'previous_overall': previous,
+                **{key: int(values[i]) for key, values in scores.items()}
+            }
+            for i, (url, timestamp, previous) in enumerate(keys)
+        ]
+        Path(args.output).write_text(json.dumps(rows, indent=2), encoding='utf-8')
+        print(f"Scores written to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+import gzip
+import io
+import queue
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from src.http_cache import http_cache
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class _Stopped(Exception):
+    """Raised inside a worker when the consumer has stopped reading"""
+
+
+class SitemapParser:
+    """Streaming sitemap reader for plain, gzipped and index sitemaps
+
+    Documents are parsed incrementally with iterparse and each <url> or
+    <sitemap> element is discarded as soon as it has been read, so memory
+    stays flat however many URLs a sitemap lists. Sitemaps referenced by an
+    index are fetched concurrently by up to max_workers threads; their URLs
+    are handed to the consumer through a bounded queue.
+    """
+
+    def __init__(self, headers=None, max_workers=4, max_sitemaps=1000, queue_size=10000):
+        self.headers = headers
+        self.max_workers = max_workers
+        self.max_sitemaps = max_sitemaps
+        self.queue_size = queue_size
+
+    def iter_urls(self, sitemap_url, stats=None):
+        """Yield (loc, lastmod) for every URL reachable from a sitemap or sitemap index
+
+        If a stats dict is given it is filled in with the number of sitemaps
+        read, whether the root was an index, and the sitemaps that failed.
+        Stopping iteration early cancels the remaining fetches.
+        """
+        if stats is None:
+            stats = {}
+        stats.update({'sitemap_count': 0, 'is_index': False, 'skipped': 0, 'errors': []})
+
+        entries = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        seen = set()
+        lock = threading.Lock()
+        pending = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        def schedule(url):
+            nonlocal pending
+            with lock:
+                if url in seen:
+                    return
+                if len(seen) >= self.max_sitemaps:
+                    stats['skipped'] += 1
+                    return
+                seen.add(url)
+                pending += 1
+            executor.submit(read, url)
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    entries.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+            raise _Stopped()
+
+        def read(url):
+            error = None
+            try:
+                for kind, loc, lastmod in self._entries(url):
+                    if kind == 'sitemap':
+                        if url == sitemap_url:
+                            stats['is_index'] = True
+                        schedule(loc)
+                    else:
+                        put(('url', loc, lastmod))
+            except _Stopped:
+                return
+            except Exception as e:
+                error = str(e)
+            try:
+                put(('done', url, error))
+            except _Stopped:
+                pass
+
+        try:
+            schedule(sitemap_url)
+            while pending:
+                kind, first, second = entries.get()
+                if kind == 'url':
+                    yield first, second
+                    continue
+                with lock:
+                    pending -= 1
+                stats['sitemap_count'] += 1
+                if second is not None:
+                    stats['errors'].append({'url': first, 'error': second})
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def summarize(self, sitemap_url):
+        """URL count and latest lastmod of a sitemap, computed in one streaming pass"""
+        stats = {}
+        url_count = 0
+        latest = None
+        for _, lastmod in self.iter_urls(sitemap_url, stats):
+            url_count += 1
+            if lastmod and (latest is None or lastmod > latest):
+                latest = lastmod
+
+        for error in stats['errors']:
+            if error['url'] == sitemap_url:
+                # Only a 404 says there is no sitemap; other failures may be transient
+                if error['error'] == 'HTTP 404':
+                    return {'exists': False}
+                return {'exists': False, 'error': error['error']}
+        return {
+            'exists': True,
+            'url_count': url_count,
+            'last_modified': latest,
+            'is_index': stats['is_index'],
+            'sitemap_count': stats['sitemap_count'],
+            'sitemaps_skipped': stats['skipped'],
+            'errors': stats['errors']
+        }
+
+    def _entries(self, url):
+        """Yield ('url' | 'sitemap', loc, lastmod) from one sitemap document"""
+        status_code, stream = http_cache.open_stream(url, headers=self.headers)
+        with stream:
+            if status_code != 200:
+                raise ValueError(f"HTTP {status_code}")
+            yield from self._parse(self._decompressed(stream))
+
+    def _decompressed(self, stream):
+        """Wrap the stream in a gzip reader if it starts with the gzip magic number"""
+        if not hasattr(stream, 'peek'):
+            stream = io.BufferedReader(stream)
+        if stream.peek(2)[:2] == GZIP_MAGIC:
+            return gzip.GzipFile(fileobj=stream)
+        return stream
+
+    def _parse(self, stream):
+        """Incrementally parse <url> and <sitemap> entries, dropping each once read"""
+        root = None
+        for event, elem in ET.iterparse(stream, events=('start', 'end')):
+            if root is None:
+                root = elem
+                continue
+            if event != 'end':
+                continue
+            kind = _local_name(elem.tag)
+            if kind not in ('url', 'sitemap'):
+                continue
+            loc = lastmod = None
+            for child in elem:
+                name = _local_name(child.tag)
+                if name == 'loc':
+                    loc = (child.text or '').strip()
+                elif name == 'lastmod':
+                    lastmod = (child.text or '').strip() or None
+            root.clear()
+            if loc:
+                yield kind, loc, lastmod
+
+
+def _local_name(tag):
+    """Tag name without its XML namespace"""
+    return tag.rsplit('}', 1)[-1]
@@ -0,0 +1,35 @@
+from functools import cached_property
+from nltk.tokenize import word_tokenize, sent_tokenize
+
+
+class TextDocument:
+    """A text with its tokenized representations, each computed once on first use
+
+    ContentCollector's analyses all work from the same sentences and
+    lower-cased tokens, so they share one TextDocument instead of each
+    tokenizing the text again.
+    """
+
+    def __init__(self, text, stop_words):
+        self.text = text
+        self.stop_words = stop_words
+
+    @cached_property
+    def sentences(self):
+        """Sentences of the original text"""
+        return sent_tokenize(self.text)
+
+    @cached_property
+    def tokens(self):
+        """Every token of the lower-cased text, punctuation included"""
+        return word_tokenize(self.text.lower())
+
+    @cached_property
+    def words(self):
+        """Alphanumeric tokens"""
+        return [word for word in self.tokens if word.isalnum()]
+
+    @cached_property
+    def content_words(self):
+        """Alphanumeric tokens that are not stop words"""
+        return [word for word in self.words if word not in self.stop_words]
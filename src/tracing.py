@@ -0,0 +1,168 @@
+"""Per-stage spans attached to reports, and their export as Prometheus metrics
+
+A Trace is activated around the work for one report; code anywhere below it
+records stages with
+
+    with span('parse', parser='lxml') as attributes:
+        ...
+        attributes['tags'] = count
+
+Spans are recorded into the trace active in the calling context and are
+no-ops when none is. Worker threads do not inherit the context on their own,
+so work handed to an executor is wrapped with bind().
+"""
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+_current_trace = contextvars.ContextVar('current_trace', default=None)
+
+QUANTILES = (0.5, 0.95)
+
+
+class Trace:
+    """Spans recorded while generating one report"""
+
+    def __init__(self):
+        self.spans = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        """Record spans from the current context into this trace"""
+        token = _current_trace.set(self)
+        try:
+            yield self
+        finally:
+            _current_trace.reset(token)
+
+    def add(self, name, start, seconds, attributes):
+        with self._lock:
+            self.spans.append({
+                'name': name,
+                'start': round(start - self._start, 4),
+                'seconds': round(seconds, 4),
+                **attributes
+            })
+
+    def to_dict(self):
+        """Spans sorted by start time, and the time since the trace began"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s['start'])
+        return {
+            'total_seconds': round(time.perf_counter() - self._start, 4),
+            'spans': spans
+        }
+
+
+@contextmanager
+def span(name, **attributes):
+    """Time a stage; yields a dict of attributes the caller may add to"""
+    trace = _current_trace.get()
+    start = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        if trace is not None:
+            trace.add(name, start, time.perf_counter() - start, attributes)
+
+
+def record_usage(attributes, response, hit, seconds):
+    """Add token counts and throughput of an LLM completion to span attributes"""
+    usage = response.get('usage', {}) if response else {}
+    completion_tokens = usage.get('completion_tokens', 0)
+    attributes['prompt_tokens'] = usage.get('prompt_tokens', 0)
+    attributes['completion_tokens'] = completion_tokens
+    attributes['cache_hit'] = hit
+    # Cached completions cost no inference, so they have no throughput
+    attributes['tokens_per_second'] = (
+        round(completion_tokens / seconds, 1) if not hit and seconds > 0 else None
+    )
+
+
+def bind(fn):
+    """Wrap fn to run in a copy of the current context, for use from another thread"""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+    return run
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def stage_summary(traces):
+    """Count, total, p50, p95 and max seconds per span name across traces"""
+    durations = {}
+    for trace in traces:
+        for s in trace.get('spans', []):
+            durations.setdefault(s['name'], []).append(s['seconds'])
+    return {
+        name: {
+            'count': len(values),
+            'total_seconds': round(sum(values), 4),
+            'p50': percentile(values, 0.5),
+            'p95': percentile(values, 0.95),
+            'max': max(values)
+        }
+        for name, values in sorted(durations.items())
+    }
+
+
+def write_prometheus(traces, path):
+    """Write stage latencies and LLM token counts in the Prometheus text format"""
+    durations = {}
+    tokens = {'prompt': 0, 'completion': 0}
+    tokens_per_second = []
+    for trace in traces:
+        for s in trace.get('spans', []):
+            durations.setdefault(s['name'], []).append(s['seconds'])
+            if 'prompt_tokens' in s:
+                tokens['prompt'] += s['prompt_tokens'] or 0
+                tokens['completion'] += s.get('completion_tokens') or 0
+            if s.get('tokens_per_second'):
+                tokens_per_second.append(s['tokens_per_second'])
+
+    lines = [
+        '# HELP report_stage_seconds Time spent in each report generation stage.',
+        '# TYPE report_stage_seconds summary'
+    ]
+    for name, values in sorted(durations.items()):
+        for q in QUANTILES:
+            lines.append(f'report_stage_seconds{{stage="{_label(name)}",quantile="{q}"}} {percentile(values, q)}')
+        lines.append(f'report_stage_seconds_sum{{stage="{_label(name)}"}} {round(sum(values), 4)}')
+        lines.append(f'report_stage_seconds_count{{stage="{_label(name)}"}} {len(values)}')
+
+    lines += [
+        '# HELP llm_tokens_total Tokens processed by LLM completions.',
+        '# TYPE llm_tokens_total counter',
+        f'llm_tokens_total{{kind="prompt"}} {tokens["prompt"]}',
+        f'llm_tokens_total{{kind="completion"}} {tokens["completion"]}',
+        '# HELP llm_tokens_per_second Throughput of uncached LLM completions.',
+        '# TYPE llm_tokens_per_second summary'
+    ]
+    for q in QUANTILES:
+        value = percentile(tokens_per_second, q)
+        lines.append(f'llm_tokens_per_second{{quantile="{q}"}} {value if value is not None else "NaN"}')
+    lines.append(f'llm_tokens_per_second_sum {round(sum(tokens_per_second), 2)}')
+    lines.append(f'llm_tokens_per_second_count {len(tokens_per_second)}')
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return path
+
+
+def _label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,38 @@
+import re
+import pytest
+import src.text_document as text_document
+from src.readability import readability_batch, readability_reports
+from src.text_document import TextDocument
+
+
+@pytest.fixture
+def simple_tokenizers(monkeypatch):
+    """Regex tokenizers, so the tests do not need the NLTK punkt data"""
+    monkeypatch.setattr(text_document, 'sent_tokenize', lambda text: [s for s in re.split(r'(?<=[.!?])\s+', text) if s])
+    monkeypatch.setattr(text_document, 'word_tokenize', lambda text: re.findall(r"\w+|[^\w\s]", text))
+
+
+def test_document_without_main_text_is_empty():
+    # trafilatura returns None for pages without main content
+    assert readability_reports([TextDocument(None, frozenset())]) == [{}]
+    assert readability_reports([None, '']) == [{}, {}]
+
+
+def test_empty_documents_count_as_zero_in_a_batch(simple_tokenizers):
+    stats = readability_batch([None, 'Brake repair is quick. Book today!'])
+    assert stats['word_count'].tolist() == [0, 6]
+    assert stats['sentence_count'].tolist() == [0, 2]
+    assert stats['syllable_count'][0] == 0
+
+
+def test_reports_match_the_flesch_formula(simple_tokenizers):
+    report, empty = readability_reports(['Brake repair is quick. Book today!', None])
+    syllables = 9  # vowel runs: br(a)k(e) r(e)p(ai)r (i)s q(ui)ck b(oo)k t(o)d(ay)
+    flesch = 206.835 - 1.015 * (6 / 2) - 84.6 * (syllables / 6)
+    assert report == {
+        'flesch_reading_ease': min(100, max(0, flesch)),
+        'avg_sentence_length': 3.0,
+        'avg_syllables_per_word': syllables / 6,
+        'complexity_level': 'Fairly Easy'
+    }
+    assert empty == {}